@@ -0,0 +1,158 @@
+# benchmark.py
+#
+# Benchmark suite for the backtest tooling.
+#
+#   python benchmark.py               -> runs every benchmark
+#   python benchmark.py cold_start    -> runs only the selected ones
+#
+# Each benchmark prints a small table with the median wall time (ms).
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+import statistics
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# =========================================================
+# HELPERS
+# =========================================================
+
+def time_call(fn, repeat: int = 5) -> float:
+    """Median wall time of `fn()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def print_table(title: str, rows: list[tuple[str, float]]):
+    print(f"\n📏 {title}")
+    print(f"{'Case':<48} {'Median (ms)':>12}")
+    print("-" * 61)
+    for name, ms in rows:
+        print(f"{name:<48} {ms:>12.1f}")
+
+# =========================================================
+# COLD START
+# =========================================================
+
+COLD_START_CASES = [
+    ("python -c pass (interpreter)", ["-c", "pass"]),
+    ("import executor", ["-c", "import executor"]),
+    ("executor.py --help", ["executor.py", "--help"]),
+    (
+        "scanning.py --help",
+        [os.path.join("strategy", "accumulation_zone", "scanning.py"), "--help"]
+    ),
+]
+
+
+def bench_cold_start(repeat: int = 5):
+    rows = []
+    for name, args in COLD_START_CASES:
+        def spawn():
+            subprocess.run(
+                [sys.executable, *args],
+                cwd=BASE_DIR,
+                check=True,
+                stdout=subprocess.DEVNULL
+            )
+        rows.append((name, time_call(spawn, repeat)))
+
+    print_table("Cold start (fresh interpreter per run)", rows)
+
+# =========================================================
+# ZONE ACTIVITY
+# =========================================================
+
+def synthetic_ohlc(n_bars: int, seed: int = 0):
+    """Random-walk candles (deterministic for a given seed)."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.004, n_bars)))
+    open_ = np.r_[close[0], close[:-1]]
+    wick = np.abs(rng.normal(0, 0.002, (2, n_bars)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    return open_, high, low, close
+
+
+def bench_zone_activity(repeat: int = 5):
+    sys.path.insert(0, BASE_DIR)
+
+    from strategy.accumulation_zone.accumulation_zone import (
+        TOTAL_ZONES,
+        compute_log_zones,
+        log_zones_activity_strategy,
+        zone_activity,
+        zone_activity_reference,
+    )
+
+    lookback = 200
+    open_, high, low, close = synthetic_ohlc(3000)
+    limits = compute_log_zones(
+        low[:lookback].min(), high[:lookback].max(), TOTAL_ZONES
+    )
+
+    def windows(fn):
+        return lambda: [
+            fn(open_[:lookback], close[:lookback], limits)
+            for _ in range(100)
+        ]
+
+    def month(**kwargs):
+        return lambda: log_zones_activity_strategy(
+            open_, high, low, close, lookback=lookback, **kwargs
+        )
+
+    rows = [
+        ("zone_activity_reference x100 windows", time_call(
+            windows(zone_activity_reference), repeat
+        )),
+        ("zone_activity x100 windows", time_call(
+            windows(zone_activity), repeat
+        )),
+        ("strategy 3000 bars", time_call(month(), repeat)),
+        ("strategy 3000 bars, records", time_call(
+            month(return_records=True), repeat
+        )),
+    ]
+
+    print_table("Zone activity (200-bar windows)", rows)
+
+# =========================================================
+# REGISTRY
+# =========================================================
+
+BENCHMARKS = {
+    "cold_start": bench_cold_start,
+    "zone_activity": bench_zone_activity,
+}
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run benchmark suite.")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help=f"benchmarks to run (default: all): {', '.join(BENCHMARKS)}"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name](repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
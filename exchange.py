@@ -1,58 +1,83 @@
 # exchange.py
 
-import ccxt
-import yaml
 import os
+from functools import lru_cache
 
 # =========================================================
 # Load config.yaml
 # =========================================================
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.yaml")
-with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
 
-EXCHANGE_NAME = config["exchange"]["name"].lower()
-MARKET_TYPE = config["exchange"].get("market", "spot").lower()
+
+def load_exchange_config(path: str = CONFIG_PATH) -> dict:
+    """
+    Lê a seção `exchange` do config.yaml (somente quando necessário).
+    """
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f)
+
+    return config["exchange"]
 
 # =========================================================
 # Função para instanciar a exchange correta
 # =========================================================
-def get_exchange():
+def get_exchange(exchange_cfg: dict | None = None):
     """
     Retorna uma instância CCXT de acordo com nome e tipo de mercado.
+
+    O ccxt só é importado aqui, para não pesar no startup dos CLIs.
     """
+    import ccxt
 
-    if EXCHANGE_NAME == "binance":
+    if exchange_cfg is None:
+        exchange_cfg = load_exchange_config()
+
+    exchange_name = exchange_cfg["name"].lower()
+    market_type = exchange_cfg.get("market", "spot").lower()
+
+    if exchange_name == "binance":
         # Spot
-        if MARKET_TYPE == "spot":
+        if market_type == "spot":
             return ccxt.binance({
                 "enableRateLimit": True
             })
         # USDT-margined Futures
-        elif MARKET_TYPE == "futures":
+        elif market_type == "futures":
             return ccxt.binanceusdm({
                 "enableRateLimit": True
             })
         # Coin-margined Futures
-        elif MARKET_TYPE == "coinm":
+        elif market_type == "coinm":
             return ccxt.binance({
                 "enableRateLimit": True,
                 "options": {"defaultType": "delivery"}
             })
         else:
-            raise ValueError(f"Tipo de mercado '{MARKET_TYPE}' não suportado para Binance.")
+            raise ValueError(f"Tipo de mercado '{market_type}' não suportado para Binance.")
 
     # Outras exchanges
     exchange_map = {
-        "bybit": ccxt.bybit,
-        "huobi": ccxt.huobi,
-        "coinbase": ccxt.coinbase,
+        "bybit": "bybit",
+        "huobi": "huobi",
+        "coinbase": "coinbase",
     }
 
-    if EXCHANGE_NAME not in exchange_map:
+    if exchange_name not in exchange_map:
         raise ValueError(
-            f"Exchange '{EXCHANGE_NAME}' não suportada. "
+            f"Exchange '{exchange_name}' não suportada. "
             f"Escolha uma das: {list(exchange_map.keys())}"
         )
 
-    return exchange_map[EXCHANGE_NAME]({"enableRateLimit": True})
+    exchange_cls = getattr(ccxt, exchange_map[exchange_name])
+    return exchange_cls({"enableRateLimit": True})
+
+
+@lru_cache(maxsize=None)
+def shared_exchange(name: str, market: str = "spot"):
+    """
+    Instância única e preguiçosa por (exchange, mercado): só é criada
+    no primeiro download real.
+    """
+    return get_exchange({"name": name, "market": market})
@@ -1,65 +1,73 @@
 # executor.py
 
 import os
-import yaml
+import sys
 import shutil
-import pandas as pd
-import vectorbt as vbt
-from tqdm import tqdm
+import argparse
 
-from datetime import datetime, timezone, date
-from dateutil.relativedelta import relativedelta
-
-from exchange import get_exchange
-from strategy.accumulation_zone.accumulation_zone import (
-    log_zones_activity_strategy
-)
+from collections import namedtuple
+from datetime import date
 
 # =========================================================
-# LOAD GLOBAL CONFIG
+# PATHS
 # =========================================================
 
-BASE_DIR = os.path.dirname(__file__)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BASE_DIR, "config.yaml")
 
-with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-    config = yaml.safe_load(f)
-
-SYMBOLS = config["symbols"]
-TIMEFRAMES = config["timeframes"]
-INITIAL_BALANCE = config["execution"].get("initial_balance", 1000.0)
-
-date_cfg = config["date_range"]
-OUTPUT_FOLDER = config["output"]["folder"]
-
 # =========================================================
-# LOAD STRATEGY CONFIG
+# LOAD CONFIG
 # =========================================================
 
-STRATEGY_CONFIG_PATH = os.path.join(
-    BASE_DIR,
-    "strategy",
-    "accumulation_zone",
-    "config.yaml"
-)
-
-with open(STRATEGY_CONFIG_PATH, "r", encoding="utf-8") as f:
-    strategy_cfg = yaml.safe_load(f)["strategy"]
-
-MAX_LOSS_PERCENT = strategy_cfg.get("max_loss_percent", None)
-MIN_PERCENT_FROM_EXTREME = strategy_cfg["activity"]["min_percent_from_extreme"]
-
-# =========================================================
-# EXCHANGE
-# =========================================================
-
-exchange = get_exchange()
+def load_yaml(path: str) -> dict:
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def load_settings(
+    config_path: str = CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    strategy_name: str | None = None
+) -> dict:
+    """
+    A estratégia vem de `strategy_name` ou da chave global `strategy:`;
+    sem `strategy_config_path`, usa o config.yaml da própria estratégia.
+    """
+    from strategy.registry import get_strategy
+
+    config = load_yaml(config_path)
+    strategy = get_strategy(strategy_name or config.get("strategy"))
+    strategy_cfg = load_yaml(
+        strategy_config_path or strategy.config_path
+    )["strategy"]
+
+    return {
+        "strategy": strategy,
+        "params": strategy.params(strategy_cfg),
+        "exchange": config["exchange"],
+        "symbols": config["symbols"],
+        "timeframes": config["timeframes"],
+        "initial_balance": config["execution"].get("initial_balance", 1000.0),
+        "panel": config["execution"].get("panel", False),
+        "shared_cash": config["execution"].get("shared_cash", False),
+        "intrabar_timeframe": (
+            config["execution"].get("intrabar_timeframe", None)
+        ),
+        "reset_on_gaps": config["execution"].get("reset_on_gaps", False),
+        "streaming": config["execution"].get("streaming", False),
+        "date_range": config["date_range"],
+        "data": config.get("data", {}),
+        "output_folder": config["output"]["folder"],
+        "annotations": config["output"].get("annotations", False),
+    }
 
 # =========================================================
 # HELPERS
 # =========================================================
 
-def build_base_filename(symbol: str) -> str:
+def build_base_filename(symbol: str, date_cfg: dict) -> str:
     symbol_clean = symbol.replace("/", "")
     return (
         f"{symbol_clean}_"
@@ -69,6 +77,9 @@ def build_base_filename(symbol: str) -> str:
 
 
 def generate_month_ranges(start_year, start_month, end_year, end_month):
+    import pandas as pd
+    from dateutil.relativedelta import relativedelta
+
     ranges = []
     current = date(start_year, start_month, 1)
     end = date(end_year, end_month, 1)
@@ -100,88 +111,293 @@ def clean_output_folder(path: str):
 # FETCH OHLCV
 # =========================================================
 
-def fetch_ohlcv(symbol: str, timeframe: str) -> pd.DataFrame:
-    start_date = datetime(
+def base_timeframe(settings: dict) -> str:
+    """
+    Timeframe baixado da exchange; inclui o intrabar, para que as barras
+    maiores sejam agregadas dos mesmos candles usados nas saídas.
+    """
+    from market_data import resolve_base_timeframe
+
+    timeframes = list(settings["timeframes"])
+    if settings["intrabar_timeframe"]:
+        timeframes.append(settings["intrabar_timeframe"])
+
+    return resolve_base_timeframe(timeframes, settings["data"])
+
+
+def fetch_ohlcv(symbol: str, timeframe: str, settings: dict):
+    """
+    Candles do período configurado, vindos do cache local; timeframes
+    maiores são agregados a partir do timeframe base.
+    """
+    from market_data import load_ohlcv
+
+    date_cfg = settings["date_range"]
+
+    return load_ohlcv(
+        symbol,
+        timeframe,
+        (date_cfg["start_year"], date_cfg["start_month"]),
+        (date_cfg["end_year"], date_cfg["end_month"]),
+        settings["exchange"],
+        settings["data"],
+        base_timeframe(settings)
+    )
+
+
+def fetch_month(
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int,
+    settings: dict
+):
+    """Candles de um único mês, vindos do cache local."""
+    from market_data import load_ohlcv
+
+    return load_ohlcv(
+        symbol,
+        timeframe,
+        (year, month),
+        (year, month),
+        settings["exchange"],
+        settings["data"],
+        base_timeframe(settings)
+    )
+
+# =========================================================
+# PANEL (MULTI-SYMBOL)
+# =========================================================
+
+PANEL_FIELDS = ("open", "high", "low", "close")
+
+
+def build_panel(frames: dict) -> dict:
+    """
+    Alinha os candles de vários símbolos no mesmo índice de tempo.
+
+    Retorna {campo: DataFrame (barras x símbolos)}; barras que faltam em
+    um símbolo ficam NaN.
+    """
+    import pandas as pd
+
+    return {
+        field: pd.concat(
+            {symbol: df[field] for symbol, df in frames.items()},
+            axis=1,
+            join="outer"
+        ).sort_index()
+        for field in PANEL_FIELDS
+    }
+
+
+def run_panel_backtest(settings: dict, generated_files: list[str]):
+    """
+    Modo painel: todos os símbolos no mesmo índice de tempo, sinais
+    gerados como matriz (barras x símbolos) e cada mês simulado como um
+    único portfolio VectorBT agrupado.
+
+    Com `shared_cash` o grupo usa um único caixa e cada entrada vale
+    `initial_balance / n_symbols`; senão cada símbolo recebe o próprio
+    `initial_balance`.
+    """
+    import numpy as np
+    import pandas as pd
+    import vectorbt as vbt
+    from tqdm import tqdm
+
+    from strategy.registry import panel_signals
+
+    date_cfg = settings["date_range"]
+    output_folder = settings["output_folder"]
+    initial_balance = settings["initial_balance"]
+    shared_cash = settings["shared_cash"]
+
+    month_ranges = generate_month_ranges(
         date_cfg["start_year"],
         date_cfg["start_month"],
-        1,
-        tzinfo=timezone.utc
-    )
-    end_date = datetime(
         date_cfg["end_year"],
-        date_cfg["end_month"],
-        28,
-        tzinfo=timezone.utc
+        date_cfg["end_month"]
     )
 
-    since = int(start_date.timestamp() * 1000)
-    end_ts = int(end_date.timestamp() * 1000)
-
-    ohlcv = []
-
-    with tqdm(
-        desc=f"Downloading candlesticks {symbol} {timeframe}",
-        unit="batch"
-    ) as pbar:
-        while since < end_ts:
-            batch = exchange.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                since=since,
-                limit=1000
+    for timeframe in settings["timeframes"]:
+        print(f"\n⏱  Timeframe: {timeframe} (panel)")
+
+        frames = {}
+        for symbol in settings["symbols"]:
+            df = fetch_ohlcv(symbol, timeframe, settings)
+            if not df.empty:
+                frames[symbol] = df
+
+        if not frames:
+            continue
+
+        panel = build_panel(frames)
+        symbols = list(frames)
+
+        if shared_cash:
+            sizing = {
+                "init_cash": initial_balance,
+                "size": initial_balance / len(symbols),
+                "size_type": "value",
+            }
+        else:
+            sizing = {"init_cash": initial_balance}
+
+        base_name = (
+            f"PANEL_{len(symbols)}_"
+            f"{date_cfg['start_month']}_{date_cfg['start_year']}_"
+            f"{date_cfg['end_month']}_{date_cfg['end_year']}"
+        )
+        stats_file = os.path.join(
+            output_folder,
+            f"{base_name}_{timeframe}_strategy.xlsx"
+        )
+        trades_file = os.path.join(
+            output_folder,
+            f"{base_name}_{timeframe}_trades.xlsx"
+        )
+
+        all_monthly_stats = []
+        all_trades = []
+
+        for month_start, month_end in tqdm(month_ranges, unit="month"):
+            month = {
+                field: values.loc[month_start:month_end]
+                for field, values in panel.items()
+            }
+            if month["close"].empty:
+                continue
+
+            entries_l, exits_l, entries_s, exits_s = panel_signals(
+                settings["strategy"],
+                month["open"].values,
+                month["high"].values,
+                month["low"].values,
+                month["close"].values,
+                settings["params"]
+            )
+
+            # Barras ausentes não têm sinais; o preço é propagado apenas
+            # para a avaliação das posições abertas.
+            close = month["close"].ffill().bfill()
+
+            def as_frame(values):
+                return pd.DataFrame(
+                    values,
+                    index=close.index,
+                    columns=close.columns
+                )
+
+            portfolio = vbt.Portfolio.from_signals(
+                close=close,
+                entries=as_frame(entries_l),
+                exits=as_frame(exits_l),
+                short_entries=as_frame(entries_s),
+                short_exits=as_frame(exits_s),
+                group_by=True,
+                cash_sharing=shared_cash,
+                freq=timeframe,
+                **sizing
             )
-            if not batch:
-                break
-            ohlcv.extend(batch)
-            since = batch[-1][0] + 1
-            pbar.update(1)
-
-    if not ohlcv:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(
-        ohlcv,
-        columns=["timestamp", "open", "high", "low", "close", "volume"]
-    )
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-    df.set_index("timestamp", inplace=True)
-    df.index = df.index.tz_convert(None)
 
-    return df
+            stats = portfolio.stats()
+            stats["symbol"] = ",".join(symbols)
+            stats["timeframe"] = timeframe
+            stats["year"] = month_start.year
+            stats["month"] = month_start.month
+            all_monthly_stats.append(stats)
+
+            records = portfolio.trades.records
+            if records is not None and not records.empty:
+                trades = records.copy()
+                trades["symbol"] = np.asarray(symbols)[trades["col"].values]
+                trades["timeframe"] = timeframe
+                trades["year"] = month_start.year
+                trades["month"] = month_start.month
+                all_trades.append(trades)
+
+        if all_monthly_stats:
+            pd.DataFrame(all_monthly_stats).to_excel(stats_file, index=False)
+            generated_files.append(stats_file)
+
+        if all_trades:
+            pd.concat(all_trades).to_excel(trades_file, index=False)
+            generated_files.append(trades_file)
 
 # =========================================================
 # RUN BACKTEST
 # =========================================================
 
-def run():
-    print(f"\n🧹 Cleaning output folder: {OUTPUT_FOLDER}")
-    clean_output_folder(OUTPUT_FOLDER)
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+def month_intrabar(df, fine_df, timeframe: str):
+    """Índice intrabar do mês: candles finos de cada barra de `df`."""
+    from market_data import build_intrabar_index, timeframe_to_ms
 
-    generated_files: list[str] = []
+    to_ms = 1_000_000  # ns -> ms
+
+    return build_intrabar_index(
+        bar_ts=df.index.asi8 // to_ms,
+        bar_ms=timeframe_to_ms(timeframe),
+        fine_ts=fine_df.index.asi8 // to_ms,
+        fine_high=fine_df["high"].values,
+        fine_low=fine_df["low"].values
+    )
+
+
+def run_symbol_backtests(settings: dict, generated_files: list[str]):
+    """
+    Backtest mensal por símbolo/timeframe.
+
+    Com `execution.intrabar_timeframe` (ex.: 1m), as saídas são executadas
+    no nível atingido (stop ou alvo) em vez do close, e barras que tocam
+    os dois níveis são resolvidas pelos candles desse timeframe menor.
+    """
+    import numpy as np
+    import pandas as pd
+    import vectorbt as vbt
+    from tqdm import tqdm
+
+    from market_data import gap_mask
 
-    for symbol in SYMBOLS:
+    date_cfg = settings["date_range"]
+    output_folder = settings["output_folder"]
+    initial_balance = settings["initial_balance"]
+    intrabar_timeframe = settings["intrabar_timeframe"]
+    strategy = settings["strategy"]
+
+    for symbol in settings["symbols"]:
         print(f"\n⚙️  Running backtest for {symbol}")
 
-        base_name = build_base_filename(symbol)
+        base_name = build_base_filename(symbol, date_cfg)
+
+        fine_full = (
+            fetch_ohlcv(symbol, intrabar_timeframe, settings)
+            if intrabar_timeframe else None
+        )
 
-        for timeframe in TIMEFRAMES:
+        for timeframe in settings["timeframes"]:
             print(f"\n⏱  Timeframe: {timeframe}")
 
             stats_file = os.path.join(
-                OUTPUT_FOLDER,
+                output_folder,
                 f"{base_name}_{timeframe}_strategy.xlsx"
             )
 
             trades_file = os.path.join(
-                OUTPUT_FOLDER,
+                output_folder,
                 f"{base_name}_{timeframe}_trades.xlsx"
             )
 
+            annotations_file = os.path.join(
+                output_folder,
+                f"{base_name}_{timeframe}_annotations.csv"
+            )
+
             all_monthly_stats = []
             all_trades = []
+            all_annotations = []
 
-            df_full = fetch_ohlcv(symbol, timeframe)
+            df_full = fetch_ohlcv(symbol, timeframe, settings)
             if df_full.empty:
                 continue
 
@@ -197,16 +413,53 @@ def run():
                 if df.empty:
                     continue
 
-                entries_l, exits_l, entries_s, exits_s = (
-                    log_zones_activity_strategy(
-                        open_=df["open"].values,
-                        high=df["high"].values,
-                        low=df["low"].values,
-                        close=df["close"].values,
-                        max_loss_percent=MAX_LOSS_PERCENT,
-                        min_percent_from_extreme=MIN_PERCENT_FROM_EXTREME
+                # Índice sobre a série fina inteira: a última barra do mês
+                # também recebe todos os seus candles finos
+                intrabar = (
+                    month_intrabar(df, fine_full, timeframe)
+                    if fine_full is not None else None
+                )
+
+                # Só as opções ativas, para estratégias que não as têm
+                options = {}
+                if intrabar is not None:
+                    options["intrabar"] = intrabar
+                if settings["annotations"]:
+                    options["return_records"] = True
+                if settings["reset_on_gaps"]:
+                    options["gaps"] = gap_mask(
+                        df.index.asi8 // 1_000_000, timeframe
                     )
+
+                signals = strategy.signals(
+                    df["open"].values,
+                    df["high"].values,
+                    df["low"].values,
+                    df["close"].values,
+                    **settings["params"],
+                    **options
                 )
+                entries_l, exits_l, entries_s, exits_s = signals[:4]
+
+                if settings["annotations"]:
+                    annotations = pd.DataFrame(signals[-1], index=df.index)
+                    annotations["entry_long"] = entries_l
+                    annotations["exit_long"] = exits_l
+                    annotations["entry_short"] = entries_s
+                    annotations["exit_short"] = exits_s
+                    all_annotations.append(annotations)
+
+                # Saídas no nível atingido (exceto quando a mesma barra
+                # também abre posição, que continua no close)
+                price = df["close"].values.copy()
+                if intrabar is not None:
+                    exit_prices = signals[4]
+                    fill = (
+                        np.isfinite(exit_prices)
+                        & ~entries_l
+                        & ~entries_s
+                    )
+                    price[fill] = exit_prices[fill]
 
                 portfolio = vbt.Portfolio.from_signals(
                     close=df["close"],
@@ -214,7 +467,8 @@ def run():
                     exits=exits_l,
                     short_entries=entries_s,
                     short_exits=exits_s,
-                    init_cash=INITIAL_BALANCE,
+                    price=price,
+                    init_cash=initial_balance,
                     freq=timeframe
                 )
 
@@ -248,6 +502,311 @@ def run():
                 )
                 generated_files.append(trades_file)
 
+            if all_annotations:
+                pd.concat(all_annotations).to_csv(annotations_file)
+                generated_files.append(annotations_file)
+
+
+# =========================================================
+# STREAMING (OUT-OF-CORE)
+# =========================================================
+
+# Posição do portfolio carregada entre meses: caixa no fim do mês, tamanho
+# (negativo = short), preço e horário da entrada original e a última barra
+# do mês (onde a posição é reaberta)
+Carry = namedtuple(
+    "Carry",
+    ["cash", "size", "entry_price", "entry_time", "last_bar"]
+)
+
+
+def append_csv(frame, path: str):
+    """Acrescenta linhas ao CSV (cabeçalho só na criação)."""
+    frame.to_csv(path, mode="a", header=not os.path.exists(path))
+
+
+def run_streaming_backtest(settings: dict, generated_files: list[str]):
+    """
+    Backtest contínuo do período inteiro, lido do cache mês a mês.
+
+    Em memória ficam só o mês corrente, as últimas `warmup - 1` barras do
+    mês anterior (contexto da janela) e o estado aberto: a posição da
+    estratégia (`Strategy.streaming`) e a do portfolio, reaberta na última
+    barra do mês anterior com o mesmo preço e tamanho. Estatísticas
+    mensais, trades fechados e anotações são acrescentados em CSV a cada
+    mês, então o pico de memória não depende do tamanho do histórico.
+    """
+    import numpy as np
+    import pandas as pd
+    import vectorbt as vbt
+    from tqdm import tqdm
+
+    from market_data import gap_mask, iter_months
+
+    date_cfg = settings["date_range"]
+    output_folder = settings["output_folder"]
+    intrabar_timeframe = settings["intrabar_timeframe"]
+    strategy = settings["strategy"]
+
+    tail_size = strategy.warmup(settings["params"]) - 1
+    months = list(iter_months(
+        date_cfg["start_year"],
+        date_cfg["start_month"],
+        date_cfg["end_year"],
+        date_cfg["end_month"]
+    ))
+
+    for symbol in settings["symbols"]:
+        print(f"\n⚙️  Streaming backtest for {symbol}")
+
+        base_name = build_base_filename(symbol, date_cfg)
+
+        for timeframe in settings["timeframes"]:
+            print(f"\n⏱  Timeframe: {timeframe}")
+
+            stats_file = os.path.join(
+                output_folder,
+                f"{base_name}_{timeframe}_strategy.csv"
+            )
+            trades_file = os.path.join(
+                output_folder,
+                f"{base_name}_{timeframe}_trades.csv"
+            )
+            annotations_file = os.path.join(
+                output_folder,
+                f"{base_name}_{timeframe}_annotations.csv"
+            )
+
+            tail = None
+            state = None
+            carry = None
+            cash = settings["initial_balance"]
+
+            for year, month in tqdm(months, unit="month"):
+                df_month = fetch_month(
+                    symbol, timeframe, year, month, settings
+                )
+                if df_month.empty:
+                    continue
+
+                df = (
+                    pd.concat([tail, df_month])
+                    if tail is not None else df_month
+                )
+                n_tail = len(df) - len(df_month)
+
+                options = {}
+                if intrabar_timeframe:
+                    options["intrabar"] = month_intrabar(
+                        df,
+                        fetch_month(
+                            symbol, intrabar_timeframe, year, month, settings
+                        ),
+                        timeframe
+                    )
+                if settings["annotations"]:
+                    options["return_records"] = True
+                if settings["reset_on_gaps"]:
+                    options["gaps"] = gap_mask(
+                        df.index.asi8 // 1_000_000, timeframe
+                    )
+
+                signals = strategy.streaming(
+                    df["open"].values,
+                    df["high"].values,
+                    df["low"].values,
+                    df["close"].values,
+                    state,
+                    **settings["params"],
+                    **options
+                )
+                state = signals[-1]
+
+                # Só as barras do mês (o contexto nunca tem sinais)
+                entries_l, exits_l, entries_s, exits_s = (
+                    values[n_tail:] for values in signals[:4]
+                )
+
+                if settings["annotations"]:
+                    annotations = pd.DataFrame(
+                        signals[-2][n_tail:], index=df_month.index
+                    )
+                    annotations["entry_long"] = entries_l
+                    annotations["exit_long"] = exits_l
+                    annotations["entry_short"] = entries_s
+                    annotations["exit_short"] = exits_s
+                    append_csv(annotations, annotations_file)
+
+                price = df_month["close"].values.copy()
+                if intrabar_timeframe:
+                    exit_prices = signals[4][n_tail:]
+                    fill = (
+                        np.isfinite(exit_prices)
+                        & ~entries_l
+                        & ~entries_s
+                    )
+                    price[fill] = exit_prices[fill]
+
+                close = df_month["close"]
+                size = np.full(len(df_month), np.inf)
+                init_cash = cash
+
+                # Posição aberta no mês anterior: reaberta na última barra
+                # dele, ao preço e tamanho originais
+                if carry is not None:
+                    close = pd.concat([carry.last_bar, close])
+                    entries_l = np.r_[carry.size > 0, entries_l]
+                    entries_s = np.r_[carry.size < 0, entries_s]
+                    exits_l = np.r_[False, exits_l]
+                    exits_s = np.r_[False, exits_s]
+                    price = np.r_[carry.entry_price, price]
+                    size = np.r_[abs(carry.size), size]
+                    init_cash = carry.cash + carry.size * carry.entry_price
+
+                portfolio = vbt.Portfolio.from_signals(
+                    close=close,
+                    entries=entries_l,
+                    exits=exits_l,
+                    short_entries=entries_s,
+                    short_exits=exits_s,
+                    price=price,
+                    size=size,
+                    init_cash=init_cash,
+                    freq=timeframe
+                )
+
+                stats = portfolio.stats()
+                stats["symbol"] = symbol
+                stats["timeframe"] = timeframe
+                stats["year"] = year
+                stats["month"] = month
+                append_csv(stats.to_frame().T, stats_file)
+
+                records = portfolio.trades.records
+                entry_time = close.index[records["entry_idx"].values]
+
+                # A entrada reaberta é a do mês em que a posição começou
+                if carry is not None:
+                    entry_time = entry_time.where(
+                        records["entry_idx"].values != 0, carry.entry_time
+                    )
+
+                closed = (records["status"] == 1).values
+                if closed.any():
+                    trades = records[closed].copy()
+                    trades["entry_time"] = entry_time[closed]
+                    trades["exit_time"] = close.index[
+                        trades["exit_idx"].values
+                    ]
+                    trades["symbol"] = symbol
+                    trades["timeframe"] = timeframe
+                    trades["year"] = year
+                    trades["month"] = month
+                    append_csv(trades, trades_file)
+
+                cash = float(portfolio.cash().values[-1])
+                assets = float(portfolio.assets().values[-1])
+
+                if assets != 0:
+                    open_trade = np.flatnonzero(~closed)[-1]
+                    carry = Carry(
+                        cash,
+                        assets,
+                        float(records["entry_price"].values[open_trade]),
+                        entry_time[open_trade],
+                        df_month["close"].iloc[-1:]
+                    )
+                else:
+                    carry = None
+
+                tail = df.iloc[max(len(df) - tail_size, 0):]
+
+            equity = (
+                cash + carry.size * float(carry.last_bar.iloc[0])
+                if carry is not None else cash
+            )
+            print(f"Final equity: {equity:.2f}")
+
+            for path in (stats_file, trades_file, annotations_file):
+                if os.path.exists(path):
+                    generated_files.append(path)
+
+
+def run(
+    config_path: str = CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    strategy_name: str | None = None,
+    panel: bool | None = None,
+    shared_cash: bool | None = None,
+    intrabar_timeframe: str | None = None,
+    annotations: bool | None = None,
+    reset_on_gaps: bool | None = None,
+    streaming: bool | None = None
+):
+    from strategy.registry import check_features
+
+    settings = load_settings(config_path, strategy_config_path, strategy_name)
+
+    if panel is not None:
+        settings["panel"] = panel
+    if shared_cash is not None:
+        settings["shared_cash"] = shared_cash
+    if intrabar_timeframe is not None:
+        settings["intrabar_timeframe"] = intrabar_timeframe
+    if annotations is not None:
+        settings["annotations"] = annotations
+    if reset_on_gaps is not None:
+        settings["reset_on_gaps"] = reset_on_gaps
+    if streaming is not None:
+        settings["streaming"] = streaming
+
+    # Opções inválidas falham antes de limpar a pasta de saída
+    if settings["streaming"] and settings["panel"]:
+        raise ValueError("Streaming and panel modes cannot be combined")
+
+    if settings["panel"]:
+        # O painel só gera as quatro matrizes de sinais por símbolo
+        unsupported = [
+            option
+            for option in (
+                "intrabar_timeframe", "annotations", "reset_on_gaps"
+            )
+            if settings[option]
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Panel mode does not support: {', '.join(unsupported)}"
+            )
+    else:
+        strategy = settings["strategy"]
+
+        if settings["streaming"] and strategy.streaming is None:
+            raise ValueError(
+                f"Strategy '{strategy.name}' has no streaming backend"
+            )
+
+        check_features(
+            strategy,
+            intrabar=settings["intrabar_timeframe"],
+            records=settings["annotations"],
+            gaps=settings["reset_on_gaps"]
+        )
+
+    output_folder = settings["output_folder"]
+
+    print(f"\n🧹 Cleaning output folder: {output_folder}")
+    clean_output_folder(output_folder)
+    os.makedirs(output_folder, exist_ok=True)
+
+    generated_files: list[str] = []
+
+    if settings["streaming"]:
+        run_streaming_backtest(settings, generated_files)
+    elif settings["panel"]:
+        run_panel_backtest(settings, generated_files)
+    else:
+        run_symbol_backtests(settings, generated_files)
+
     # =====================================================
     # FINAL REPORT
     # =====================================================
@@ -264,5 +823,85 @@ def run():
 # ENTRY POINT
 # =========================================================
 
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run monthly backtests for every configured symbol "
+                    "and timeframe."
+    )
+    parser.add_argument(
+        "--config",
+        default=CONFIG_PATH,
+        help="global config file (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help="strategy folder under strategy/ (default: the `strategy` "
+             "key of the global config)"
+    )
+    parser.add_argument(
+        "--strategy-config",
+        default=None,
+        help="strategy config file (default: the strategy's config.yaml)"
+    )
+    parser.add_argument(
+        "--panel",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="run all symbols as one grouped portfolio "
+             "(default: execution.panel)"
+    )
+    parser.add_argument(
+        "--shared-cash",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="share one cash pool across the panel "
+             "(default: execution.shared_cash)"
+    )
+    parser.add_argument(
+        "--intrabar-timeframe",
+        default=None,
+        help="lower timeframe used to resolve bars that hit stop and "
+             "target (default: execution.intrabar_timeframe)"
+    )
+    parser.add_argument(
+        "--annotations",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="export per-bar strategy records (extreme %%, loss %%, zone, "
+             "levels) with the signals (default: output.annotations)"
+    )
+    parser.add_argument(
+        "--reset-on-gaps",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="restart the lookback window after missing candles "
+             "(default: execution.reset_on_gaps)"
+    )
+    parser.add_argument(
+        "--streaming",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="one continuous backtest streamed from the cache month by "
+             "month, with bounded memory (default: execution.streaming)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    run(
+        args.config,
+        args.strategy_config,
+        strategy_name=args.strategy,
+        panel=args.panel,
+        shared_cash=args.shared_cash,
+        intrabar_timeframe=args.intrabar_timeframe,
+        annotations=args.annotations,
+        reset_on_gaps=args.reset_on_gaps,
+        streaming=args.streaming
+    )
+
+
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
@@ -0,0 +1,1054 @@
+# golden.py
+#
+# Golden-result regression harness for the accumulation_zone engines.
+#
+#   python golden.py                 -> checks every fixture
+#   python golden.py --update        -> (re)records the expected outputs
+#   python golden.py --add-fixture ETH/USDT 15m 2024 1
+#                                    -> copies a month of the local cache
+#                                       into golden/fixtures/
+#
+# Fixtures are OHLCV arrays (N x 6, same layout as the candle cache) in
+# golden/fixtures/, optionally with the finer candles of the same period
+# for the intrabar checks. The synthetic ones are generated once by
+# `--update` and then kept as files, so they never depend on the RNG
+# implementation.
+#
+# Expected outputs (golden/expected/) are recorded from the reference
+# engine below: the original strategy (one `compute_log_zones` per window
+# and the inline candle x zone loop), kept here on purpose so a refactor
+# of the strategy module can never change it. Every backend must
+# reproduce it exactly over the whole scanner grid, plus combos whose
+# max loss sits inside the candidates' loss range (so the filter rejects
+# some entries):
+#
+#   signals    reference / vectorized / batched / streaming
+#   intrabar   signals + `exit_prices` with the fine candles (fixtures
+#              that have them)
+#   records    per-bar records (`return_records`) for the default params
+#   zones      per-window `compute_log_zones` vs `rolling_log_zones`
+#   trades     VectorBT trade records for the default parameters
+#   scanner    month return and trade returns per combo, one portfolio
+#              per combo (`simulate_month`) vs `simulate_month_grid`
+#   risk       `risk_managed_return` vs the vectorized Monte Carlo rules
+#
+# Timings of each backend are stored with the expected outputs and shown
+# next to the current ones (the first VectorBT call of a run also pays the
+# Numba compilation, so compare them between runs, not between rows).
+
+import os
+import sys
+import time
+import argparse
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = os.path.join(BASE_DIR, "golden")
+FIXTURE_DIR = os.path.join(GOLDEN_DIR, "fixtures")
+EXPECTED_DIR = os.path.join(GOLDEN_DIR, "expected")
+
+# Parâmetros fixos: independentes do config.yaml do usuário
+GOLDEN_PARAMS = {
+    "lookback": 200,
+    "max_loss_percent": 0.5,
+    "min_percent_from_extreme": 60.0,
+}
+
+# Combos além do grid do scanner: perdas máximas dentro da faixa das
+# entradas candidatas das fixtures (~0.3% a 1%), para o filtro atuar
+GOLDEN_EXTRA_COMBOS = tuple(
+    {"max_loss_percent": max_loss, "min_percent_from_extreme": extreme}
+    for max_loss in (0.3, 0.4, 0.5)
+    for extreme in (40.0, 55.0)
+)
+
+# Regras do scanner usadas nas checagens (risco mensal + alavancagem)
+GOLDEN_SCAN_SETTINGS = {
+    "initial_balance": 1000.0,
+    "risk_enabled": True,
+    "max_monthly_drawdown": -5.0,
+    "max_recovery_trades": 5,
+    "monthly_profit_target": 10.0,
+    "min_first_trade_profit": 10.0,
+    "leverage_enabled": True,
+    "leverage_value": 5.0,
+}
+
+TRADE_FIELDS = (
+    "entry_idx", "exit_idx", "size", "entry_price",
+    "exit_price", "pnl", "direction", "status",
+)
+
+STREAMING_CHUNKS = 4
+
+# =========================================================
+# FIXTURES
+# =========================================================
+
+def synthetic_candles(
+    n_bars: int,
+    seed: int,
+    timeframe_ms: int = 15 * 60_000,
+    doji_every: int = 0,
+    drop: tuple = ()
+):
+    """
+    Random walk (N x 6). `doji_every` força open == close a cada k
+    barras; `drop` remove intervalos [início, fim) para criar buracos.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.004, n_bars)))
+    open_ = np.r_[close[0], close[:-1]]
+    if doji_every:
+        close[::doji_every] = open_[::doji_every]
+
+    wick = np.abs(rng.normal(0, 0.002, (2, n_bars)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    volume = rng.random(n_bars) * 100
+
+    ts = 1_704_067_200_000 + np.arange(n_bars) * timeframe_ms  # 2024-01-01
+    data = np.column_stack([ts, open_, high, low, close, volume])
+
+    keep = np.ones(n_bars, dtype=bool)
+    for start, end in drop:
+        keep[start:end] = False
+    return data[keep]
+
+
+def synthetic_intrabar(
+    n_bars: int,
+    seed: int,
+    per_bar: int = 3,
+    spike_every: int = 17,
+    timeframe_ms: int = 15 * 60_000
+):
+    """
+    Random walk com os candles finos de cada barra (`per_bar` por
+    barra): o preço vai do open ao close passando pela máxima e pela
+    mínima em ordem aleatória, então o OHLC dos finos reagrega exatamente
+    nas barras. A cada `spike_every` barras os pavios crescem 1-3%, para
+    haver barras que tocam stop e alvo ao mesmo tempo, e entre elas o
+    open salta até 2%, para haver saídas preenchidas no open.
+    """
+    import numpy as np
+
+    data = synthetic_candles(n_bars, seed, timeframe_ms)
+    ts, open_, high, low, close, volume = data.T
+
+    rng = np.random.default_rng(seed)
+
+    spikes = np.arange(spike_every, n_bars, spike_every)
+    high[spikes] *= 1 + rng.uniform(0.01, 0.03, len(spikes))
+    low[spikes] *= 1 - rng.uniform(0.01, 0.03, len(spikes))
+
+    jumps = spikes - spike_every // 2
+    open_[jumps] *= 1 + rng.uniform(-0.02, 0.02, len(jumps))
+    np.maximum(high, open_, out=high)
+    np.minimum(low, open_, out=low)
+
+    # Passos (distintos) em que o caminho toca cada extremo
+    touches = np.sort(
+        np.argsort(rng.random((n_bars, per_bar - 1)), axis=1)[:, :2] + 1,
+        axis=1
+    )
+    high_first = rng.random(n_bars) < 0.5
+    first = np.where(high_first, high, low)
+    second = np.where(high_first, low, high)
+
+    steps = np.arange(per_bar + 1)
+    path = np.array([
+        np.interp(
+            steps,
+            (0, touches[i, 0], touches[i, 1], per_bar),
+            (open_[i], first[i], second[i], close[i])
+        )
+        for i in range(n_bars)
+    ])
+    fine_open = path[:, :-1].ravel()
+    fine_close = path[:, 1:].ravel()
+
+    fine = np.column_stack([
+        (ts[:, None] + np.arange(per_bar) * (timeframe_ms // per_bar)).ravel(),
+        fine_open,
+        np.maximum(fine_open, fine_close),
+        np.minimum(fine_open, fine_close),
+        fine_close,
+        np.repeat(volume / per_bar, per_bar),
+    ])
+    return data, fine
+
+
+# nome -> (candles, candles finos ou None)
+SYNTHETIC_FIXTURES = {
+    "synthetic_walk": lambda: (synthetic_candles(2976, seed=0), None),
+    "synthetic_doji_gaps": lambda: (
+        synthetic_candles(
+            2976, seed=1, doji_every=7, drop=((900, 912), (2000, 2001))
+        ),
+        None
+    ),
+    "synthetic_intrabar": lambda: synthetic_intrabar(2976, seed=4),
+}
+
+
+def fixture_path(name: str) -> str:
+    return os.path.join(FIXTURE_DIR, f"{name}.npz")
+
+
+def save_fixture(name: str, data, timeframe: str, fine=None):
+    import numpy as np
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    np.savez_compressed(
+        fixture_path(name),
+        data=data,
+        timeframe=np.array(timeframe),
+        **({} if fine is None else {"fine": fine})
+    )
+
+
+def load_fixture(name: str):
+    """(candles, timeframe, candles finos ou None)"""
+    import numpy as np
+
+    with np.load(fixture_path(name)) as f:
+        fine = f["fine"] if "fine" in f.files else None
+        return f["data"], str(f["timeframe"]), fine
+
+
+def list_fixtures() -> list[str]:
+    if not os.path.isdir(FIXTURE_DIR):
+        return []
+    return sorted(
+        name[:-len(".npz")]
+        for name in os.listdir(FIXTURE_DIR)
+        if name.endswith(".npz")
+    )
+
+
+def add_fixture(symbol: str, timeframe: str, year: int, month: int):
+    """Grava um mês do cache local (baixado se faltar) como fixture."""
+    sys.path.insert(0, BASE_DIR)
+
+    from executor import CONFIG_PATH, load_yaml
+    from market_data import load_month
+
+    config = load_yaml(CONFIG_PATH)
+    data = load_month(
+        symbol,
+        timeframe,
+        year,
+        month,
+        config["exchange"],
+        config.get("data", {})
+    )
+
+    name = f"{symbol.replace('/', '')}_{timeframe}_{year}_{month:02d}"
+    save_fixture(name, data, timeframe)
+    print(f"📦 Fixture saved: {fixture_path(name)} ({len(data)} bars)")
+
+# =========================================================
+# REFERENCE ENGINE
+# =========================================================
+
+def reference_select(activity, n, largest):
+    """Top / bottom N determinístico (igual Pine): o primeiro empate vence."""
+    import numpy as np
+
+    selected = []
+    for _ in range(n):
+        best_val = -np.inf if largest else np.inf
+        best_idx = -1
+        for i, val in enumerate(activity):
+            if i in selected:
+                continue
+            if (val > best_val) if largest else (val < best_val):
+                best_val = val
+                best_idx = i
+        selected.append(best_idx)
+    return sorted(selected)
+
+
+def reference_strategy(
+    open_,
+    high,
+    low,
+    close,
+    gaps,
+    lookback=200,
+    max_loss_percent=None,
+    min_percent_from_extreme=55.0,
+    fine_bars=None,
+    return_records=False
+):
+    """
+    Estratégia original (laço barra a barra, janela a janela). Adições:
+    nenhuma entrada é avaliada se a janela contém uma barra marcada em
+    `gaps` depois da primeira (regra de `reset_on_gaps`); com
+    `fine_bars` (candles finos de cada barra, ver `reference_fine_bars`)
+    retorna também o preço de cada saída; com `return_records=True`, um
+    dict campo -> array com o que decidiu cada barra.
+    """
+    import numpy as np
+
+    from strategy.accumulation_zone import accumulation_zone as az
+
+    total_zones = az.TOTAL_ZONES
+    top_active = az.TOP_ACTIVE
+    bottom_active = az.BOTTOM_ACTIVE
+    target_long = az.TARGET_LONG_OFFSET
+    target_short = az.TARGET_SHORT_OFFSET
+
+    n = len(close)
+
+    entries_long = np.zeros(n, dtype=bool)
+    exits_long = np.zeros(n, dtype=bool)
+    entries_short = np.zeros(n, dtype=bool)
+    exits_short = np.zeros(n, dtype=bool)
+
+    exit_prices = np.full(n, np.nan)
+    records = {
+        "percent_from_extreme": np.full(n, np.nan),
+        "central_zone": np.full(n, -1),
+        "side": np.zeros(n, dtype=int),
+        "loss_percent": np.full(n, np.nan),
+        "entry": np.full(n, np.nan),
+        "stop": np.full(n, np.nan),
+        "target": np.full(n, np.nan),
+        "in_position": np.zeros(n, dtype=bool),
+        "accepted": np.zeros(n, dtype=bool),
+    }
+
+    in_long = False
+    in_short = False
+
+    stop_price = None
+    target_price = None
+
+    def exit_price(i, is_long, stop_hit, target_hit):
+        # Stop e alvo na mesma barra: o primeiro candle fino que toca
+        # algum dos dois decide (sem toque, o stop)
+        if stop_hit and target_hit:
+            for _, _, f_high, f_low, _, _ in fine_bars[i]:
+                if is_long:
+                    stop_hit = f_low <= stop_price
+                    target_hit = f_high >= target_price
+                else:
+                    stop_hit = f_high >= stop_price
+                    target_hit = f_low <= target_price
+                if stop_hit or target_hit:
+                    break
+            else:
+                stop_hit = True
+
+        level = stop_price if stop_hit else target_price
+
+        # Abriu além do nível: sai no open
+        if is_long == stop_hit:
+            return open_[i] if open_[i] < level else level
+        return open_[i] if open_[i] > level else level
+
+    for i in range(lookback - 1, n):
+
+        # Gerenciamento de posição
+        if in_long:
+            stop_hit = low[i] <= stop_price
+            target_hit = high[i] >= target_price
+            if stop_hit or target_hit:
+                exits_long[i] = True
+                in_long = False
+                if fine_bars is not None:
+                    exit_prices[i] = exit_price(
+                        i, True, stop_hit, target_hit
+                    )
+
+        if in_short:
+            stop_hit = high[i] >= stop_price
+            target_hit = low[i] <= target_price
+            if stop_hit or target_hit:
+                exits_short[i] = True
+                in_short = False
+                if fine_bars is not None:
+                    exit_prices[i] = exit_price(
+                        i, False, stop_hit, target_hit
+                    )
+
+        in_position = in_long or in_short
+
+        # Os registros são calculados mesmo com posição aberta
+        if in_position and not return_records:
+            continue
+
+        # Janela reativa
+        start = i - lookback + 1
+        end = i + 1
+
+        if gaps[start + 1:end].any():
+            continue
+
+        w_open = open_[start:end]
+        w_close = close[start:end]
+        w_low = low[start:end]
+        w_high = high[start:end]
+
+        last_extreme = max(np.argmax(w_close), np.argmin(w_close))
+        percent = (lookback - last_extreme - 1) / lookback * 100.0
+        if percent < min_percent_from_extreme and not return_records:
+            continue
+
+        limits = np.exp(np.linspace(
+            np.log(float(w_low.min())),
+            np.log(float(w_high.max())),
+            total_zones + 1
+        ))
+
+        activity_up = np.zeros(total_zones, dtype=float)
+        activity_down = np.zeros(total_zones, dtype=float)
+
+        for j in range(len(w_close)):
+            o = float(w_open[j])
+            c = float(w_close[j])
+
+            if c == o:
+                continue
+
+            if c > o:
+                body_low, body_high, target_array = o, c, activity_up
+            else:
+                body_low, body_high, target_array = c, o, activity_down
+
+            if body_low <= 0:
+                continue
+
+            for z in range(total_zones):
+                inter_low = max(body_low, limits[z])
+                inter_high = min(body_high, limits[z + 1])
+
+                if inter_high > inter_low:
+                    amp = (inter_high - inter_low) / body_low * 100.0
+                    target_array[z] += amp
+
+        activity_total = activity_up + activity_down
+
+        records["percent_from_extreme"][i] = percent
+        records["in_position"][i] = in_position
+
+        top_zones = reference_select(activity_total, top_active, True)
+        if top_active != 3 or not (
+            top_zones[1] == top_zones[0] + 1
+            and top_zones[2] == top_zones[1] + 1
+        ):
+            continue
+
+        central_zone = top_zones[1]
+        reference_select(activity_total, bottom_active, False)
+
+        records["central_zone"][i] = central_zone
+
+        side = 0
+
+        # LONG
+        if central_zone + target_long < total_zones:
+            level = limits[central_zone + 1]
+            if close[i - 1] <= level and close[i] > level:
+                side = 1
+                stop = (limits[central_zone] + level) / 2
+                target = limits[central_zone + target_long]
+                loss = (level - stop) / level * 100.0
+
+        # SHORT
+        if side == 0 and central_zone - target_short >= 0:
+            level = limits[central_zone]
+            if close[i - 1] >= level and close[i] < level:
+                side = -1
+                stop = (limits[central_zone] + limits[central_zone + 1]) / 2
+                target = limits[central_zone - target_short]
+                loss = (stop - level) / level * 100.0
+
+        if side == 0:
+            continue
+
+        records["side"][i] = side
+        records["loss_percent"][i] = loss
+        records["entry"][i] = level
+        records["stop"][i] = stop
+        records["target"][i] = target
+
+        if in_position or percent < min_percent_from_extreme:
+            continue
+
+        stop_price = stop
+        target_price = target
+
+        if max_loss_percent and loss > max_loss_percent:
+            continue
+
+        records["accepted"][i] = True
+        if side > 0:
+            entries_long[i] = True
+            in_long = True
+        else:
+            entries_short[i] = True
+            in_short = True
+
+    # Conflitos
+    exits_long |= entries_short
+    exits_short |= entries_long
+
+    conflict = entries_long & entries_short
+    entries_long[conflict] = False
+    entries_short[conflict] = False
+    exits_long[conflict] = False
+    exits_short[conflict] = False
+
+    result = (entries_long, exits_long, entries_short, exits_short)
+
+    if fine_bars is not None:
+        result += (exit_prices,)
+
+    if return_records:
+        result += (records,)
+
+    return result
+
+
+def reference_fine_bars(bar_ts, bar_ms, fine):
+    """Candles finos de cada barra: os com abertura em [ts, ts + bar)."""
+    return [
+        fine[(fine[:, 0] >= ts) & (fine[:, 0] < ts + bar_ms)]
+        for ts in bar_ts
+    ]
+
+# =========================================================
+# BACKENDS
+# =========================================================
+
+def signal_backends():
+    """{nome: fn(o, h, l, c, gaps, combos) -> bool (4 x combos x barras)}"""
+    import numpy as np
+
+    from strategy.accumulation_zone import accumulation_zone as az
+
+    def stack(columns):
+        return np.stack([np.stack(col) for col in columns], axis=1)
+
+    def per_combo(fn):
+        def run(o, h, l, c, gaps, combos):
+            return stack([
+                fn(o, h, l, c, gaps=gaps, **{**GOLDEN_PARAMS, **combo})[:4]
+                for combo in combos
+            ])
+        return run
+
+    def batched(o, h, l, c, gaps, combos):
+        *matrices, columns = az.log_zones_activity_batched(
+            o, h, l, c, combos, gaps=gaps, **GOLDEN_PARAMS
+        )
+        return np.stack([m[:, columns].T for m in matrices])
+
+    def streaming(o, h, l, c, gaps, combos):
+        tail = GOLDEN_PARAMS["lookback"] - 1
+        cuts = np.linspace(0, len(c), STREAMING_CHUNKS + 1).astype(int)
+
+        def chained(o, h, l, c, gaps, **params):
+            state = None
+            parts = []
+            for start, end in zip(cuts[:-1], cuts[1:]):
+                first = max(start - tail, 0)
+                *signals, state = az.log_zones_activity_streaming(
+                    o[first:end], h[first:end], l[first:end], c[first:end],
+                    state=state,
+                    gaps=gaps[first:end],
+                    **params
+                )
+                parts.append([s[start - first:] for s in signals[:4]])
+            return [np.concatenate(k) for k in zip(*parts)]
+
+        return per_combo(chained)(o, h, l, c, gaps, combos)
+
+    return {
+        "reference": per_combo(reference_strategy),
+        "vectorized": per_combo(az.log_zones_activity_strategy),
+        "batched": batched,
+        "streaming": streaming,
+    }
+
+
+def intrabar_backends(bar_ts, bar_ms, fine):
+    """
+    {nome: fn(o, h, l, c, gaps, combos) -> (sinais, preços de saída
+    (combos x barras))}, com os candles finos `fine` (N x 6).
+    """
+    import numpy as np
+
+    from market_data import build_intrabar_index
+    from strategy.accumulation_zone import accumulation_zone as az
+
+    def per_combo(fn, **kwargs):
+        def run(o, h, l, c, gaps, combos):
+            results = [
+                fn(
+                    o, h, l, c,
+                    gaps=gaps,
+                    **kwargs,
+                    **{**GOLDEN_PARAMS, **combo}
+                )
+                for combo in combos
+            ]
+            return (
+                np.stack([np.stack(r[:4]) for r in results], axis=1),
+                np.stack([r[4] for r in results])
+            )
+        return run
+
+    def reference(o, h, l, c, gaps, combos):
+        fine_bars = reference_fine_bars(bar_ts, bar_ms, fine)
+        return per_combo(reference_strategy, fine_bars=fine_bars)(
+            o, h, l, c, gaps, combos
+        )
+
+    def vectorized(o, h, l, c, gaps, combos):
+        intrabar = build_intrabar_index(
+            bar_ts, bar_ms, fine[:, 0], fine[:, 2], fine[:, 3]
+        )
+        return per_combo(az.log_zones_activity_strategy, intrabar=intrabar)(
+            o, h, l, c, gaps, combos
+        )
+
+    return {"reference": reference, "vectorized": vectorized}
+
+
+def records_backends():
+    """{nome: fn(o, h, l, c, gaps) -> {campo: array por barra}}"""
+    from strategy.accumulation_zone import accumulation_zone as az
+
+    def reference(o, h, l, c, gaps):
+        return reference_strategy(
+            o, h, l, c, gaps, return_records=True, **GOLDEN_PARAMS
+        )[-1]
+
+    def vectorized(o, h, l, c, gaps):
+        records = az.log_zones_activity_strategy(
+            o, h, l, c, gaps=gaps, return_records=True, **GOLDEN_PARAMS
+        )[-1]
+        return {field: records[field] for field in records.dtype.names}
+
+    return {"reference": reference, "vectorized": vectorized}
+
+
+def scan_settings():
+    from strategy.registry import get_strategy
+
+    return {
+        **GOLDEN_SCAN_SETTINGS,
+        "strategy": get_strategy("accumulation_zone"),
+        "params": GOLDEN_PARAMS,
+    }
+
+
+def scanner_backends():
+    """{nome: fn(df, tf, combos) -> (retornos, retornos dos trades)}"""
+    from strategy.accumulation_zone.scanning import (
+        simulate_month,
+        simulate_month_grid,
+        trade_returns_pct,
+    )
+
+    settings = scan_settings()
+    capital = settings["initial_balance"]
+
+    def single(df, timeframe, combos):
+        results = [
+            simulate_month(df, combo, capital, timeframe, settings)
+            for combo in combos
+        ]
+        return (
+            [ret for ret, _ in results],
+            [trade_returns_pct(trades, settings) for _, trades in results]
+        )
+
+    def grid(df, timeframe, combos):
+        returns, trades, _ = simulate_month_grid(
+            df, combos, capital, timeframe, settings
+        )
+        return list(returns), trades
+
+    return {"single": single, "grid": grid}
+
+
+def risk_backends():
+    """{nome: fn(lista de retornos dos trades) -> retorno do mês}"""
+    import numpy as np
+
+    from strategy.accumulation_zone.monte_carlo import monthly_risk_returns
+    from strategy.accumulation_zone.scanning import risk_managed_return
+
+    settings = scan_settings()
+
+    def loop(trade_returns):
+        return np.array([
+            risk_managed_return(trades, settings)
+            for trades in trade_returns
+        ])
+
+    def vectorized(trade_returns):
+        return np.array([
+            monthly_risk_returns(np.asarray(trades)[None, :], settings)[0]
+            for trades in trade_returns
+        ])
+
+    return {"loop": loop, "vectorized": vectorized}
+
+# =========================================================
+# OUTPUTS
+# =========================================================
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+def flatten(arrays):
+    """Lista de arrays -> (valores concatenados, offsets)."""
+    import numpy as np
+
+    lengths = [len(a) for a in arrays]
+    values = (
+        np.concatenate(arrays).astype(float) if arrays else np.empty(0)
+    )
+    return values, np.r_[0, np.cumsum(lengths)]
+
+
+def strategy_constants() -> dict:
+    """Constantes do config da estratégia que mudam os resultados."""
+    from strategy.accumulation_zone import accumulation_zone as az
+
+    return {
+        "TOTAL_ZONES": az.TOTAL_ZONES,
+        "TOP_ACTIVE": az.TOP_ACTIVE,
+        "BOTTOM_ACTIVE": az.BOTTOM_ACTIVE,
+        "TARGET_LONG_OFFSET": az.TARGET_LONG_OFFSET,
+        "TARGET_SHORT_OFFSET": az.TARGET_SHORT_OFFSET,
+    }
+
+
+def compute_outputs(data, timeframe: str, fine=None):
+    """
+    Saídas de todos os backends para uma fixture:
+    {backend: {chave: array}} e {backend: ms}. Os backends intrabar só
+    rodam com os candles finos (`fine`).
+    """
+    import numpy as np
+
+    from market_data import gap_mask, timeframe_to_ms, to_dataframe
+    from strategy.accumulation_zone import accumulation_zone as az
+    from strategy.registry import param_grid
+
+    combos = param_grid(az.STRATEGY) + list(GOLDEN_EXTRA_COMBOS)
+    _, o, h, l, c, _ = data.T
+    gaps = gap_mask(data[:, 0], timeframe)
+    df = to_dataframe(data)
+
+    outputs = {}
+    timings = {}
+
+    for name, fn in signal_backends().items():
+        signals, timings[name] = timed(fn, o, h, l, c, gaps, combos)
+        outputs[name] = {"signals": signals}
+
+    if fine is not None:
+        backends = intrabar_backends(
+            data[:, 0], timeframe_to_ms(timeframe), fine
+        )
+        for name, fn in backends.items():
+            (signals, exit_prices), timings[f"intrabar_{name}"] = timed(
+                fn, o, h, l, c, gaps, combos
+            )
+            outputs[f"intrabar_{name}"] = {
+                "signals": signals,
+                "exit_prices": exit_prices,
+            }
+
+    for name, fn in records_backends().items():
+        records, timings[f"records_{name}"] = timed(fn, o, h, l, c, gaps)
+        outputs[f"records_{name}"] = records
+
+    def window_zones(low, high, lookback, n_zones):
+        return np.array([
+            az.compute_log_zones(
+                low[end - lookback:end].min(),
+                high[end - lookback:end].max(),
+                n_zones
+            )
+            for end in range(lookback, len(low) + 1)
+        ]).reshape(-1, n_zones + 1)
+
+    lookback = GOLDEN_PARAMS["lookback"]
+    for name, fn in (
+        ("zones_window", window_zones),
+        ("zones_rolling", az.rolling_log_zones),
+    ):
+        limits, timings[name] = timed(fn, l, h, lookback, az.TOTAL_ZONES)
+        outputs[name] = {"limits": limits}
+
+    from strategy.accumulation_zone.scanning import simulate_month
+
+    _, trades = simulate_month(
+        df, {}, GOLDEN_SCAN_SETTINGS["initial_balance"], timeframe,
+        scan_settings()
+    )
+    outputs["trades"] = {
+        field: trades[field].values.astype(float) for field in TRADE_FIELDS
+    }
+
+    for name, fn in scanner_backends().items():
+        (returns, trade_returns), timings[f"scanner_{name}"] = timed(
+            fn, df, timeframe, combos
+        )
+        values, offsets = flatten(trade_returns)
+        outputs[f"scanner_{name}"] = {
+            "month_returns": np.asarray(returns, dtype=float),
+            "trade_returns": values,
+            "trade_offsets": offsets,
+        }
+
+    trade_returns = [
+        outputs["scanner_single"]["trade_returns"][a:b]
+        for a, b in zip(
+            outputs["scanner_single"]["trade_offsets"][:-1],
+            outputs["scanner_single"]["trade_offsets"][1:]
+        )
+    ]
+    for name, fn in risk_backends().items():
+        returns, timings[f"risk_{name}"] = timed(fn, trade_returns)
+        outputs[f"risk_{name}"] = {"month_returns": returns}
+
+    return outputs, timings
+
+
+# Backend de onde sai a saída esperada de cada grupo
+REFERENCE_BACKEND = {
+    "signals": "reference",
+    "intrabar": "intrabar_reference",
+    "records": "records_reference",
+    "zones": "zones_window",
+    "trades": "trades",
+    "scanner": "scanner_single",
+    "risk": "risk_loop",
+}
+
+# Qual saída esperada cada backend precisa reproduzir
+EXPECTED_KEY = {
+    "reference": "signals",
+    "vectorized": "signals",
+    "batched": "signals",
+    "streaming": "signals",
+    "intrabar_reference": "intrabar",
+    "intrabar_vectorized": "intrabar",
+    "records_reference": "records",
+    "records_vectorized": "records",
+    "zones_window": "zones",
+    "zones_rolling": "zones",
+    "trades": "trades",
+    "scanner_single": "scanner",
+    "scanner_grid": "scanner",
+    "risk_loop": "risk",
+    "risk_vectorized": "risk",
+}
+
+
+def expected_path(name: str) -> str:
+    return os.path.join(EXPECTED_DIR, f"{name}.npz")
+
+
+def record_expected(name: str, outputs: dict, timings: dict):
+    """Grava a saída de referência de cada grupo (que rodou) e os tempos."""
+    import json
+
+    import numpy as np
+
+    arrays = {
+        f"{group}/{key}": value
+        for group, backend in REFERENCE_BACKEND.items()
+        if backend in outputs
+        for key, value in outputs[backend].items()
+    }
+
+    os.makedirs(EXPECTED_DIR, exist_ok=True)
+    np.savez_compressed(
+        expected_path(name),
+        constants=np.array(json.dumps(strategy_constants())),
+        timings=np.array(json.dumps(timings)),
+        **arrays
+    )
+
+
+def load_expected(name: str):
+    import json
+
+    import numpy as np
+
+    with np.load(expected_path(name)) as f:
+        arrays = {key: f[key] for key in f.files}
+
+    constants = json.loads(str(arrays.pop("constants")))
+    timings = json.loads(str(arrays.pop("timings")))
+
+    expected = {}
+    for key, value in arrays.items():
+        group, field = key.split("/", 1)
+        expected.setdefault(group, {})[field] = value
+
+    return expected, constants, timings
+
+
+def compare(actual: dict, expected: dict) -> list[str]:
+    """Campos diferentes (comparação exata, NaN == NaN)."""
+    import numpy as np
+
+    return [
+        key
+        for key, value in expected.items()
+        if key not in actual
+        or np.shape(actual[key]) != np.shape(value)
+        or not np.array_equal(actual[key], value, equal_nan=True)
+    ]
+
+# =========================================================
+# MAIN
+# =========================================================
+
+def update(names: list[str]):
+    for name, make in SYNTHETIC_FIXTURES.items():
+        if not os.path.exists(fixture_path(name)):
+            data, fine = make()
+            save_fixture(name, data, "15m", fine)
+
+    for name in names or list_fixtures():
+        data, timeframe, fine = load_fixture(name)
+        outputs, timings = compute_outputs(data, timeframe, fine)
+
+        mismatched = [
+            backend
+            for backend, group in EXPECTED_KEY.items()
+            if backend in outputs
+            and compare(outputs[backend], outputs[REFERENCE_BACKEND[group]])
+        ]
+        if mismatched:
+            print(
+                f"⚠️  {name}: {', '.join(mismatched)} differ from the "
+                "reference; recorded the reference outputs anyway"
+            )
+
+        record_expected(name, outputs, timings)
+        print(f"📝 Recorded {expected_path(name)}")
+
+
+def check(names: list[str]) -> int:
+    failures = 0
+
+    fixtures = names or list_fixtures()
+    if not fixtures:
+        print("No fixtures found: run `python golden.py --update` first.")
+        return 1
+
+    for name in fixtures:
+        if not os.path.exists(expected_path(name)):
+            print(f"\n❌ {name}: no expected outputs (run --update)")
+            failures += 1
+            continue
+
+        data, timeframe, fine = load_fixture(name)
+        expected, constants, baseline = load_expected(name)
+
+        if constants != strategy_constants():
+            print(
+                f"\n❌ {name}: strategy config changed since the outputs "
+                f"were recorded ({constants} -> {strategy_constants()}); "
+                "re-run with --update if intended"
+            )
+            failures += 1
+            continue
+
+        outputs, timings = compute_outputs(data, timeframe, fine)
+
+        print(
+            f"\n🧪 {name} ({len(data)} bars, {timeframe}"
+            f"{'' if fine is None else f', {len(fine)} intrabar candles'})"
+        )
+        print(
+            f"{'Backend':<20} {'Check':<9} {'Result':<24} "
+            f"{'ms':>9} {'recorded':>9}"
+        )
+        print("-" * 75)
+
+        for backend, group in EXPECTED_KEY.items():
+            # Grupo sem saída nesta fixture (ex.: intrabar sem candles finos)
+            if group not in expected and backend not in outputs:
+                continue
+
+            diff = (
+                compare(outputs[backend], expected[group])
+                if backend in outputs and group in expected
+                else ["missing"]
+            )
+            failures += bool(diff)
+            result = "ok" if not diff else "DIFF " + ",".join(diff)
+            ms = timings.get(backend)
+            recorded = baseline.get(backend)
+            print(
+                f"{backend:<20} {group:<9} {result:<24} "
+                f"{'' if ms is None else f'{ms:.1f}':>9} "
+                f"{'' if recorded is None else f'{recorded:.1f}':>9}"
+            )
+
+    if failures:
+        print(f"\n❌ {failures} mismatch(es)")
+        return 1
+
+    print("\n✅ All golden outputs match")
+    return 0
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Check every engine against recorded golden outputs."
+    )
+    parser.add_argument(
+        "fixtures",
+        nargs="*",
+        help="fixtures to use (default: all in golden/fixtures/)"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="record the expected outputs from the reference engine"
+    )
+    parser.add_argument(
+        "--add-fixture",
+        nargs=4,
+        metavar=("SYMBOL", "TIMEFRAME", "YEAR", "MONTH"),
+        help="save a month of the local candle cache as a fixture"
+    )
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BASE_DIR)
+
+    if args.add_fixture:
+        symbol, timeframe, year, month = args.add_fixture
+        add_fixture(symbol, timeframe, int(year), int(month))
+        return 0
+
+    if args.update:
+        update(args.fixtures)
+        return 0
+
+    return check(args.fixtures)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
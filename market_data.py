@@ -0,0 +1,593 @@
+# market_data.py
+#
+# Local OHLCV cache + multi-timeframe resampling + data integrity.
+#
+# Candles are stored one file per (exchange, symbol, timeframe, month) as
+# `.npz` arrays. Only the finest ("base") timeframe is downloaded; coarser
+# timeframes are aggregated locally from it and cached the same way, so
+# every timeframe comes from the same underlying data.
+#
+# Each download is validated with a gap index (missing intervals,
+# duplicates, out-of-order rows) built on the int64 timestamps; only the
+# missing ranges are requested again.
+#
+# Layout:
+#   <cache_folder>/<exchange>_<market>/<SYMBOL>/<timeframe>/<YYYY>-<MM>.npz
+#
+# Holes the exchange did not fill on re-fetch are recorded next to the
+# month (`<YYYY>-<MM>.unfillable.npy`) and never requested again; delete
+# that file to retry them.
+
+import os
+
+from collections import namedtuple
+from datetime import datetime, timezone
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+DAY_MS = 86_400_000
+
+TIMEFRAME_UNITS_MS = {
+    "m": 60_000,
+    "h": 3_600_000,
+    "d": DAY_MS,
+    "w": 7 * DAY_MS,
+}
+
+# =========================================================
+# TIMEFRAMES
+# =========================================================
+
+def timeframe_to_ms(timeframe: str) -> int:
+    amount, unit = timeframe[:-1], timeframe[-1]
+
+    if unit not in TIMEFRAME_UNITS_MS or not amount.isdigit():
+        raise ValueError(f"Unsupported timeframe: '{timeframe}'")
+
+    return int(amount) * TIMEFRAME_UNITS_MS[unit]
+
+
+def can_derive(timeframe: str, base_timeframe: str) -> bool:
+    """
+    Um timeframe pode ser derivado localmente se for múltiplo do base e
+    seus candles nunca atravessarem a virada do mês (divisor de 1 dia).
+    """
+    tf_ms = timeframe_to_ms(timeframe)
+    base_ms = timeframe_to_ms(base_timeframe)
+
+    return (
+        tf_ms >= base_ms
+        and tf_ms % base_ms == 0
+        and DAY_MS % tf_ms == 0
+    )
+
+
+def resolve_base_timeframe(timeframes: list[str], data_cfg: dict) -> str:
+    base = data_cfg.get("base_timeframe")
+    if base:
+        return base
+    return min(timeframes, key=timeframe_to_ms)
+
+# =========================================================
+# RESAMPLING
+# =========================================================
+
+def resample_ohlcv(data, timeframe: str):
+    """
+    Agrega candles (N x 6, ordenados por timestamp) para um timeframe
+    maior, de forma vetorizada: open = primeiro, high = máx, low = mín,
+    close = último, volume = soma.
+    """
+    import numpy as np
+
+    if len(data) == 0:
+        return data.copy()
+
+    tf_ms = timeframe_to_ms(timeframe)
+    ts = data[:, 0].astype(np.int64)
+    buckets = ts - ts % tf_ms
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(data)] - 1
+
+    out = np.empty((len(starts), 6), dtype=np.float64)
+    out[:, 0] = buckets[starts]
+    out[:, 1] = data[starts, 1]
+    out[:, 2] = np.maximum.reduceat(data[:, 2], starts)
+    out[:, 3] = np.minimum.reduceat(data[:, 3], starts)
+    out[:, 4] = data[ends, 4]
+    out[:, 5] = np.add.reduceat(data[:, 5], starts)
+
+    return out
+
+# =========================================================
+# DATA INTEGRITY
+# =========================================================
+
+# duplicates / out_of_order: máscaras sobre as linhas recebidas
+# gaps: array estruturado (GAP_DTYPE) sobre a série ordenada e sem duplicatas
+GapIndex = namedtuple("GapIndex", ["duplicates", "out_of_order", "gaps"])
+
+GAP_DTYPE = [
+    ("start", "i8"),    # primeiro timestamp ausente
+    ("end", "i8"),      # primeiro timestamp presente depois do buraco
+    ("missing", "i8"),  # candles ausentes
+]
+
+
+def build_gap_index(timestamps, timeframe: str, start=None, end=None):
+    """
+    Índice de integridade de uma série de timestamps (ms, int64), todo
+    vetorizado. Com `start`/`end` ([start, end) esperado), buracos no
+    começo e no fim também entram em `gaps`.
+    """
+    import numpy as np
+
+    ts = np.asarray(timestamps, dtype=np.int64)
+    tf_ms = timeframe_to_ms(timeframe)
+
+    out_of_order = np.zeros(len(ts), dtype=bool)
+    if len(ts) > 1:
+        out_of_order[1:] = ts[1:] < np.maximum.accumulate(ts)[:-1]
+
+    unique_ts, first = np.unique(ts, return_index=True)
+    duplicates = np.ones(len(ts), dtype=bool)
+    duplicates[first] = False
+
+    # Bordas esperadas viram "candles" fictícios para medir os buracos
+    edges = unique_ts
+    if start is not None:
+        edges = np.r_[np.int64(start - tf_ms), edges]
+    if end is not None:
+        edges = np.r_[edges, np.int64(end)]
+
+    step = np.diff(edges)
+    holes = np.flatnonzero(step > tf_ms)
+
+    gaps = np.empty(len(holes), dtype=GAP_DTYPE)
+    gaps["start"] = edges[holes] + tf_ms
+    gaps["end"] = edges[holes + 1]
+    gaps["missing"] = step[holes] // tf_ms - 1
+
+    return GapIndex(
+        duplicates=duplicates,
+        out_of_order=out_of_order,
+        gaps=gaps
+    )
+
+
+def clean_ohlcv(data):
+    """Ordena por timestamp e remove duplicatas (mantém a primeira)."""
+    import numpy as np
+
+    _, first = np.unique(data[:, 0].astype(np.int64), return_index=True)
+    return data[first]
+
+
+def gap_mask(timestamps, timeframe: str):
+    """True nas barras que vêm logo depois de candles ausentes."""
+    import numpy as np
+
+    ts = np.asarray(timestamps, dtype=np.int64)
+
+    mask = np.zeros(len(ts), dtype=bool)
+    if len(ts) > 1:
+        mask[1:] = np.diff(ts) > timeframe_to_ms(timeframe)
+    return mask
+
+
+def describe_gaps(index: GapIndex) -> str:
+    return (
+        f"{len(index.gaps)} gaps ({int(index.gaps['missing'].sum())} "
+        f"candles missing), {int(index.duplicates.sum())} duplicates, "
+        f"{int(index.out_of_order.sum())} out of order"
+    )
+
+# =========================================================
+# INTRABAR
+# =========================================================
+
+# Candles do timeframe menor + faixa [start, end) de cada barra maior
+Intrabar = namedtuple("Intrabar", ["high", "low", "start", "end"])
+
+
+def build_intrabar_index(bar_ts, bar_ms, fine_ts, fine_high, fine_low):
+    """
+    Índice barra -> faixa de candles finos, via searchsorted (uma vez só).
+
+    `bar_ts` e `fine_ts` são timestamps int64 de abertura, ordenados;
+    `bar_ms` é a duração da barra maior em ms.
+    """
+    import numpy as np
+
+    bar_ts = np.asarray(bar_ts, dtype=np.int64)
+    fine_ts = np.asarray(fine_ts, dtype=np.int64)
+
+    start = np.searchsorted(fine_ts, bar_ts, side="left")
+    end = np.searchsorted(fine_ts, bar_ts + bar_ms, side="left")
+
+    return Intrabar(
+        high=np.asarray(fine_high, dtype=float),
+        low=np.asarray(fine_low, dtype=float),
+        start=start,
+        end=end
+    )
+
+# =========================================================
+# CACHE
+# =========================================================
+
+def month_bounds_ms(year: int, month: int) -> tuple[int, int]:
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    if month == 12:
+        end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    else:
+        end = datetime(year, month + 1, 1, tzinfo=timezone.utc)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+def month_is_closed(year: int, month: int) -> bool:
+    _, end_ms = month_bounds_ms(year, month)
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    return end_ms <= now_ms
+
+
+def cache_path(
+    cache_folder: str,
+    exchange_cfg: dict,
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int
+) -> str:
+    exchange_key = (
+        f"{exchange_cfg['name'].lower()}_"
+        f"{exchange_cfg.get('market', 'spot').lower()}"
+    )
+    return os.path.join(
+        cache_folder,
+        exchange_key,
+        symbol.replace("/", ""),
+        timeframe,
+        f"{year:04d}-{month:02d}.npz"
+    )
+
+
+def load_cached(path: str):
+    import numpy as np
+
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        return f["ohlcv"]
+
+
+def save_cached(path: str, data):
+    import numpy as np
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, ohlcv=data)
+    os.replace(tmp_path, path)
+
+
+def unfillable_path(path: str) -> str:
+    return f"{path[:-len('.npz')]}.unfillable.npy"
+
+
+def load_unfillable(path: str):
+    """Buracos (GAP_DTYPE) do mês já confirmados sem dados na exchange."""
+    import numpy as np
+
+    gaps_path = unfillable_path(path)
+    if not os.path.exists(gaps_path):
+        return np.empty(0, dtype=GAP_DTYPE)
+    return np.load(gaps_path)
+
+
+def save_unfillable(path: str, gaps):
+    import numpy as np
+
+    gaps_path = unfillable_path(path)
+    if len(gaps):
+        os.makedirs(os.path.dirname(gaps_path), exist_ok=True)
+        np.save(gaps_path, gaps)
+    elif os.path.exists(gaps_path):
+        os.remove(gaps_path)
+
+# =========================================================
+# DOWNLOAD
+# =========================================================
+
+def download_ohlcv(
+    symbol: str,
+    timeframe: str,
+    since: int,
+    end_ts: int,
+    exchange_cfg: dict
+):
+    """Baixa candles [since, end_ts) da exchange como array N x 6."""
+    import numpy as np
+    from tqdm import tqdm
+
+    from exchange import shared_exchange
+
+    # The exchange is created on the first real download only
+    exchange = shared_exchange(
+        exchange_cfg["name"].lower(),
+        exchange_cfg.get("market", "spot").lower()
+    )
+
+    ohlcv = []
+
+    with tqdm(
+        desc=f"Downloading {symbol} {timeframe}",
+        unit="batch",
+        leave=False
+    ) as pbar:
+        while since < end_ts:
+            batch = exchange.fetch_ohlcv(
+                symbol=symbol,
+                timeframe=timeframe,
+                since=since,
+                limit=1000
+            )
+            if not batch:
+                break
+            ohlcv.extend(batch)
+            since = batch[-1][0] + 1
+            pbar.update(1)
+
+    data = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    return data[data[:, 0] < end_ts]
+
+
+def fill_gaps(data, symbol: str, timeframe: str, gaps, exchange_cfg: dict):
+    """Baixa de novo apenas os intervalos ausentes e junta à série."""
+    import numpy as np
+
+    patches = [
+        download_ohlcv(
+            symbol,
+            timeframe,
+            int(gap["start"]),
+            int(gap["end"]),
+            exchange_cfg
+        )
+        for gap in gaps
+    ]
+    patches = [p for p in patches if len(p)]
+
+    if not patches:
+        return data
+
+    return clean_ohlcv(np.concatenate([data, *patches]))
+
+
+def download_month(
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int,
+    exchange_cfg: dict
+):
+    """
+    Baixa um mês, valida com o índice de integridade e re-busca só os
+    intervalos que vieram faltando.
+    """
+    import numpy as np
+    from tqdm import tqdm
+
+    since, end_ts = month_bounds_ms(year, month)
+
+    # Mês em andamento: só até o último candle já fechado
+    tf_ms = timeframe_to_ms(timeframe)
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    end_ts = min(end_ts, now_ms - now_ms % tf_ms)
+
+    data = download_ohlcv(symbol, timeframe, since, end_ts, exchange_cfg)
+    index = build_gap_index(data[:, 0], timeframe, since, end_ts)
+
+    if index.duplicates.any() or index.out_of_order.any():
+        data = clean_ohlcv(data)
+
+    if len(index.gaps) and len(data):
+        data = fill_gaps(data, symbol, timeframe, index.gaps, exchange_cfg)
+
+        remaining = build_gap_index(data[:, 0], timeframe, since, end_ts)
+        if len(remaining.gaps):
+            tqdm.write(
+                f"⚠️  {symbol} {timeframe} {year}-{month:02d}: "
+                f"{describe_gaps(index)}; after re-fetch "
+                f"{len(remaining.gaps)} gaps "
+                f"({int(remaining.gaps['missing'].sum())} candles) remain"
+            )
+
+    return np.ascontiguousarray(data)
+
+
+def repair_cached(
+    data,
+    path: str,
+    symbol: str,
+    timeframe: str,
+    exchange_cfg: dict
+):
+    """
+    Re-busca os buracos internos de um mês do cache, exceto os já
+    registrados como sem dados. Os que continuam faltando passam a ser
+    registrados; o mês só é regravado se ganhou candles.
+    """
+    gaps = build_gap_index(data[:, 0], timeframe).gaps
+    unfillable = load_unfillable(path)
+    known = set(zip(
+        unfillable["start"].tolist(),
+        unfillable["end"].tolist()
+    ))
+    pending = [
+        (int(start), int(end)) not in known
+        for start, end in zip(gaps["start"], gaps["end"])
+    ]
+    if not any(pending):
+        return data
+
+    repaired = fill_gaps(
+        data, symbol, timeframe, gaps[pending], exchange_cfg
+    )
+    save_unfillable(path, build_gap_index(repaired[:, 0], timeframe).gaps)
+
+    if len(repaired) > len(data):
+        save_cached(path, repaired)
+        return repaired
+    return data
+
+# =========================================================
+# PUBLIC API
+# =========================================================
+
+def month_cache_path(
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int,
+    exchange_cfg: dict,
+    data_cfg: dict
+) -> str:
+    cache_folder = os.path.join(
+        BASE_DIR,
+        data_cfg.get("cache_folder", "cache")
+    )
+    return cache_path(
+        cache_folder, exchange_cfg, symbol, timeframe, year, month
+    )
+
+
+def month_fingerprint(
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int,
+    exchange_cfg: dict,
+    data_cfg: dict
+) -> str | None:
+    """
+    Versão gravada de um mês do cache (mtime + tamanho do arquivo), ou
+    None se ele não está no cache. Muda sempre que o mês é regravado
+    (ex.: reparado por `repair_gaps` ou reagregado do timeframe base).
+    """
+    path = month_cache_path(
+        symbol, timeframe, year, month, exchange_cfg, data_cfg
+    )
+    if not os.path.exists(path):
+        return None
+
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def load_month(
+    symbol: str,
+    timeframe: str,
+    year: int,
+    month: int,
+    exchange_cfg: dict,
+    data_cfg: dict,
+    base_timeframe: str | None = None
+):
+    """
+    Candles de um mês (N x 6). Ordem de busca: cache do timeframe pedido
+    -> agregação do timeframe base -> download direto. Meses ainda em
+    andamento nunca são gravados no cache.
+
+    Com `repair_gaps`, meses do cache têm os buracos re-buscados; um
+    timeframe derivado repara o mês base e é reagregado a partir dele.
+    """
+    import numpy as np
+
+    path = month_cache_path(
+        symbol, timeframe, year, month, exchange_cfg, data_cfg
+    )
+    derived = bool(
+        base_timeframe
+        and base_timeframe != timeframe
+        and can_derive(timeframe, base_timeframe)
+    )
+
+    cached = load_cached(path)
+    if cached is not None and not data_cfg.get("repair_gaps"):
+        return cached
+
+    if derived:
+        base = load_month(
+            symbol,
+            base_timeframe,
+            year,
+            month,
+            exchange_cfg,
+            data_cfg
+        )
+        data = resample_ohlcv(base, timeframe)
+        if cached is not None and np.array_equal(data, cached):
+            return cached
+    elif cached is not None:
+        return repair_cached(cached, path, symbol, timeframe, exchange_cfg)
+    else:
+        data = download_month(symbol, timeframe, year, month, exchange_cfg)
+
+    if month_is_closed(year, month):
+        save_cached(path, data)
+
+    return data
+
+
+def iter_months(start_year, start_month, end_year, end_month):
+    year, month = start_year, start_month
+    while (year, month) <= (end_year, end_month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def to_dataframe(data):
+    import pandas as pd
+
+    df = pd.DataFrame(data, columns=COLUMNS)
+    df["timestamp"] = pd.to_datetime(
+        df["timestamp"].astype("int64"),
+        unit="ms"
+    )
+    df.set_index("timestamp", inplace=True)
+    return df
+
+
+def load_ohlcv(
+    symbol: str,
+    timeframe: str,
+    start: tuple[int, int],
+    end: tuple[int, int],
+    exchange_cfg: dict,
+    data_cfg: dict,
+    base_timeframe: str | None = None
+):
+    """
+    DataFrame OHLCV (índice UTC naive) de `start` a `end`, ambos
+    (ano, mês) inclusivos, montado a partir do cache mensal.
+    """
+    import numpy as np
+
+    months = [
+        load_month(
+            symbol,
+            timeframe,
+            year,
+            month,
+            exchange_cfg,
+            data_cfg,
+            base_timeframe
+        )
+        for year, month in iter_months(*start, *end)
+    ]
+
+    data = np.concatenate(months) if months else np.empty((0, 6))
+    return to_dataframe(data)
@@ -2,6 +2,10 @@ import numpy as np
 import yaml
 import os
 
+from collections import namedtuple
+
+from strategy.registry import Param, Strategy
+
 # ============================================================
 # LOAD STRATEGY CONFIG
 # ============================================================
@@ -44,6 +48,26 @@ def compute_log_zones(price_min, price_max, n_zones):
     return np.exp(levels)
 
 
+def rolling_log_zones(low, high, lookback, n_zones):
+    """
+    `compute_log_zones` de todas as janelas de uma vez: log do mínimo /
+    máximo móvel e `linspace` em espaço log por linha. A linha k vale para
+    a janela que termina na barra k + lookback - 1.
+    """
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+
+    if len(low) < lookback:
+        return np.empty((0, n_zones + 1))
+
+    log_min = np.log(sliding_window_view(low, lookback).min(axis=1))
+    log_max = np.log(sliding_window_view(high, lookback).max(axis=1))
+    levels = np.linspace(log_min, log_max, n_zones + 1, axis=1)
+    return np.exp(levels)
+
+
 def select_top_n(activity, n):
     """Seleciona top N de forma determinística (igual Pine)."""
     selected = []
@@ -83,6 +107,239 @@ def select_bottom_n(activity, n):
 
     return sorted(selected)
 
+# ============================================================
+# Zonas, atividade e entradas
+# ============================================================
+
+def zone_activity(w_open, w_close, limits):
+    """
+    Atividade total (alta + baixa) de cada zona na janela.
+
+    Mesmo resultado, bit a bit, de `zone_activity_reference`: cada corpo
+    só visita as zonas que cruza (localizadas com `searchsorted` nos
+    limites), e o `bincount` soma as contribuições na ordem dos candles,
+    como o laço do Pine.
+    """
+    n_zones = len(limits) - 1
+
+    w_open = np.asarray(w_open, dtype=float)
+    w_close = np.asarray(w_close, dtype=float)
+
+    valid = (w_close != w_open) & (np.minimum(w_open, w_close) > 0)
+    is_up = (w_close > w_open)[valid]
+    body_low = np.minimum(w_open, w_close)[valid]
+    body_high = np.maximum(w_open, w_close)[valid]
+
+    # Zonas z com limits[z + 1] > body_low e limits[z] < body_high
+    first = np.searchsorted(limits[1:], body_low, side="right")
+    last = np.searchsorted(limits[:-1], body_high, side="left") - 1
+    count = np.maximum(last - first + 1, 0)
+
+    # Pares (candle, zona), candle a candle
+    candle = np.repeat(np.arange(len(body_low)), count)
+    starts = np.cumsum(count) - count
+    zone = first[candle] + np.arange(len(candle)) - starts[candle]
+
+    inter_low = np.maximum(body_low[candle], limits[zone])
+    inter_high = np.minimum(body_high[candle], limits[zone + 1])
+    amp = (inter_high - inter_low) / body_low[candle] * 100.0
+
+    hit = inter_high > inter_low
+    up = hit & is_up[candle]
+    down = hit & ~is_up[candle]
+
+    activity_up = np.bincount(zone[up], weights=amp[up], minlength=n_zones)
+    activity_down = np.bincount(
+        zone[down], weights=amp[down], minlength=n_zones
+    )
+
+    return activity_up + activity_down
+
+
+def zone_activity_reference(w_open, w_close, limits):
+    """
+    Atividade total (alta + baixa) de cada zona na janela (laço original,
+    candle x zona; referência de `zone_activity`).
+
+    CÁLCULO DE ATIVIDADE — 100% IGUAL AO PINE
+    amp = ((inter_high - inter_low) / body_low) * 100
+    """
+    activity_up = np.zeros(TOTAL_ZONES, dtype=float)
+    activity_down = np.zeros(TOTAL_ZONES, dtype=float)
+
+    for j in range(len(w_close)):
+        o = float(w_open[j])
+        c = float(w_close[j])
+
+        if c == o:
+            continue
+
+        if c > o:  # candle de alta
+            body_low = o
+            body_high = c
+            target_array = activity_up
+        else:      # candle de baixa
+            body_low = c
+            body_high = o
+            target_array = activity_down
+
+        if body_low <= 0:
+            continue  # proteção (equivalente implícito do Pine)
+
+        for z in range(TOTAL_ZONES):
+            lim_inf = limits[z]
+            lim_sup = limits[z + 1]
+
+            inter_low = max(body_low, lim_inf)
+            inter_high = min(body_high, lim_sup)
+
+            if inter_high > inter_low:
+                amp = (inter_high - inter_low) / body_low * 100.0
+                target_array[z] += amp
+
+    return activity_up + activity_down
+
+
+def select_central_zone(activity_total):
+    """Zona central das 3 mais ativas, se forem sequenciais; senão None."""
+    top_zones = select_top_n(activity_total, TOP_ACTIVE)
+
+    if TOP_ACTIVE != 3 or not zones_in_sequence(top_zones):
+        return None
+
+    return sorted(top_zones)[1]
+
+
+# Posição aberta carregada entre blocos (ver `log_zones_activity_streaming`)
+Position = namedtuple("Position", ["side", "entry", "stop", "target"])
+
+
+def entry_candidate(limits, central_zone, prev_close, curr_close):
+    """
+    Entrada possível na barra: (lado, entrada, stop, alvo).
+
+    lado = 1 (LONG: close cruza o topo da zona central para cima),
+    -1 (SHORT: cruza a base para baixo) ou 0 (nenhuma).
+    """
+    # LONG
+    if central_zone + TARGET_LONG_OFFSET < TOTAL_ZONES:
+        level = limits[central_zone + 1]
+        if prev_close <= level and curr_close > level:
+            return (
+                1,
+                level,
+                (limits[central_zone] + level) / 2,
+                limits[central_zone + TARGET_LONG_OFFSET]
+            )
+
+    # SHORT
+    if central_zone - TARGET_SHORT_OFFSET >= 0:
+        level = limits[central_zone]
+        if prev_close >= level and curr_close < level:
+            return (
+                -1,
+                level,
+                (limits[central_zone] + limits[central_zone + 1]) / 2,
+                limits[central_zone - TARGET_SHORT_OFFSET]
+            )
+
+    return 0, np.nan, np.nan, np.nan
+
+
+def entry_loss_percent(side, entry_price, stop_price):
+    """Distância (%) entre entrada e stop."""
+    if side > 0:
+        return (entry_price - stop_price) / entry_price * 100.0
+    return (stop_price - entry_price) / entry_price * 100.0
+
+
+def resolve_conflicts(entries_long, exits_long, entries_short, exits_short):
+    """Uma entrada fecha a posição oposta; entradas simultâneas se anulam."""
+    exits_long |= entries_short
+    exits_short |= entries_long
+
+    conflict = entries_long & entries_short
+    entries_long[conflict] = False
+    entries_short[conflict] = False
+    exits_long[conflict] = False
+    exits_short[conflict] = False
+
+# ============================================================
+# Resolução intrabar (stop x alvo no mesmo candle)
+# ============================================================
+
+def stop_hit_first(intrabar, i, stop_price, target_price, is_long):
+    """
+    Decide, olhando só os candles finos da barra `i`, se o stop foi
+    atingido antes do alvo. Sem dados finos, ou com os dois níveis no
+    mesmo candle fino, assume o stop (conservador).
+    """
+    start, end = intrabar.start[i], intrabar.end[i]
+    high = intrabar.high[start:end]
+    low = intrabar.low[start:end]
+
+    if is_long:
+        stop_hit = low <= stop_price
+        target_hit = high >= target_price
+    else:
+        stop_hit = high >= stop_price
+        target_hit = low <= target_price
+
+    hit = stop_hit | target_hit
+    if not hit.any():
+        return True
+
+    return bool(stop_hit[np.argmax(hit)])
+
+
+def exit_fill_price(open_price, level, is_long, is_stop):
+    """Preço de saída no nível; se o candle abriu além dele, no open."""
+    # Stop do long e alvo do short ficam abaixo do preço; os demais acima
+    below = is_long == is_stop
+    gapped = open_price < level if below else open_price > level
+    return open_price if gapped else level
+
+# ============================================================
+# Registros por barra
+# ============================================================
+
+BAR_RECORD_DTYPE = np.dtype([
+    ("percent_from_extreme", np.float64),
+    ("central_zone", np.int64),
+    ("side", np.int8),
+    ("loss_percent", np.float64),
+    ("entry", np.float64),
+    ("stop", np.float64),
+    ("target", np.float64),
+    ("in_position", np.bool_),
+    ("accepted", np.bool_),
+])
+
+
+def empty_bar_records(n):
+    records = np.zeros(n, dtype=BAR_RECORD_DTYPE)
+    for field in (
+        "percent_from_extreme", "loss_percent", "entry", "stop", "target"
+    ):
+        records[field] = np.nan
+    records["central_zone"] = -1
+    return records
+
+
+def refilter_records(records, max_loss_percent, min_percent_from_extreme):
+    """
+    Barras cuja entrada passaria pelos novos limiares (só comparações).
+    Serve tanto para registros por barra quanto para `bar_candidates`.
+    Não considera posições abertas: para os sinais completos use
+    `signals_from_candidates`.
+    """
+    mask = (records["side"] != 0) & (
+        records["percent_from_extreme"] >= min_percent_from_extreme
+    )
+    if max_loss_percent:
+        mask &= records["loss_percent"] <= max_loss_percent
+    return mask
+
 # ============================================================
 # Estratégia principal (Python = Pine)
 # ============================================================
@@ -94,8 +351,40 @@ def log_zones_activity_strategy(
     close,
     lookback=200,
     max_loss_percent=None,
-    min_percent_from_extreme=55.0
+    min_percent_from_extreme=55.0,
+    intrabar=None,
+    return_records=False,
+    gaps=None,
+    position=None,
+    return_position=False
 ):
+    """
+    Retorna (entries_long, exits_long, entries_short, exits_short).
+
+    Com `intrabar` (ver `market_data.build_intrabar_index`) retorna também
+    `exit_prices`: o nível efetivamente atingido (stop ou alvo) em cada
+    barra de saída, NaN nas demais. Quando a mesma barra toca stop e alvo,
+    a ordem é decidida pelos candles finos apenas dessa barra.
+
+    Com `return_records=True` o último item é um array estruturado
+    (`BAR_RECORD_DTYPE`, uma linha por barra) com o que decidiu cada
+    barra: % desde o último extremo, zona central, lado, perda % até o
+    stop, entrada/stop/alvo, se havia posição aberta e se a entrada foi
+    aceita. Os valores são calculados em toda barra a partir do lookback,
+    mesmo com posição aberta ou filtro reprovado, para permitir refiltrar
+    com outros limiares (ver `refilter_records`).
+
+    `gaps` (opcional, ver `market_data.gap_mask`) marca as barras que vêm
+    depois de candles ausentes: a janela recomeça nelas, e nenhuma entrada
+    é avaliada até haver `lookback` barras contínuas (posições abertas
+    continuam sendo gerenciadas).
+
+    `position` (um `Position`) é uma posição já aberta no início dos
+    dados, gerenciada a partir da barra `lookback - 1`; com
+    `return_position=True` o último item é a posição aberta no fim (ou
+    None). Juntos permitem processar o histórico em blocos (ver
+    `log_zones_activity_streaming`).
+    """
     n = len(close)
 
     entries_long = np.zeros(n, dtype=bool)
@@ -106,26 +395,79 @@ def log_zones_activity_strategy(
     in_long = False
     in_short = False
 
+    exit_prices = np.full(n, np.nan) if intrabar is not None else None
+    records = empty_bar_records(n) if return_records else None
+
+    # Limites das zonas de cada janela (linha i - lookback + 1)
+    zone_limits = rolling_log_zones(low, high, lookback, TOTAL_ZONES)
+
+    # Início do trecho contínuo de cada barra
+    segment_start = (
+        np.maximum.accumulate(np.where(gaps, np.arange(n), 0))
+        if gaps is not None else None
+    )
+
     entry_price = None
     stop_price = None
     target_price = None
 
+    if position is not None:
+        in_long = position.side > 0
+        in_short = position.side < 0
+        entry_price = position.entry
+        stop_price = position.stop
+        target_price = position.target
+
     for i in range(lookback - 1, n):
 
         # ====================================================
         # Gerenciamento de posição
         # ====================================================
         if in_long:
-            if low[i] <= stop_price or high[i] >= target_price:
+            stop_hit = low[i] <= stop_price
+            target_hit = high[i] >= target_price
+            if stop_hit or target_hit:
                 exits_long[i] = True
                 in_long = False
 
+                if exit_prices is not None:
+                    if stop_hit and target_hit:
+                        stop_hit = stop_hit_first(
+                            intrabar, i, stop_price, target_price, True
+                        )
+                    exit_prices[i] = exit_fill_price(
+                        open_[i],
+                        stop_price if stop_hit else target_price,
+                        True,
+                        stop_hit
+                    )
+
         if in_short:
-            if high[i] >= stop_price or low[i] <= target_price:
+            stop_hit = high[i] >= stop_price
+            target_hit = low[i] <= target_price
+            if stop_hit or target_hit:
                 exits_short[i] = True
                 in_short = False
 
-        if in_long or in_short:
+                if exit_prices is not None:
+                    if stop_hit and target_hit:
+                        stop_hit = stop_hit_first(
+                            intrabar, i, stop_price, target_price, False
+                        )
+                    exit_prices[i] = exit_fill_price(
+                        open_[i],
+                        stop_price if stop_hit else target_price,
+                        False,
+                        stop_hit
+                    )
+
+        # Janela atravessaria um buraco nos dados
+        if segment_start is not None and i - segment_start[i] + 1 < lookback:
+            continue
+
+        in_position = in_long or in_short
+
+        if in_position and records is None:
             continue
 
         # ====================================================
@@ -136,125 +478,314 @@ def log_zones_activity_strategy(
 
         w_open  = open_[start:end]
         w_close = close[start:end]
-        w_low   = low[start:end]
-        w_high  = high[start:end]
 
-        if percentage_since_last_extreme(w_close) < min_percent_from_extreme:
-            continue
+        percent_from_extreme = percentage_since_last_extreme(w_close)
 
-        price_min = float(w_low.min())
-        price_max = float(w_high.max())
+        # Sem registros, os filtros cortam o cálculo o quanto antes
+        if records is None and percent_from_extreme < min_percent_from_extreme:
+            continue
 
-        limits = compute_log_zones(price_min, price_max, TOTAL_ZONES)
+        limits = zone_limits[start]
 
-        activity_up = np.zeros(TOTAL_ZONES, dtype=float)
-        activity_down = np.zeros(TOTAL_ZONES, dtype=float)
+        activity_total = zone_activity(w_open, w_close, limits)
 
         # ====================================================
-        # CÁLCULO DE ATIVIDADE — 100% IGUAL AO PINE
-        #
-        # amp = ((inter_high - inter_low) / body_low) * 100
+        # Seleção Pine-like das zonas
         # ====================================================
-        for j in range(len(w_close)):
-            o = float(w_open[j])
-            c = float(w_close[j])
+        central_zone = select_central_zone(activity_total)
 
-            if c == o:
+        # ====================================================
+        # LONG / SHORT
+        # ====================================================
+        if central_zone is None:
+            side, level, stop, target = 0, np.nan, np.nan, np.nan
+        else:
+            bottom_zones = select_bottom_n(activity_total, BOTTOM_ACTIVE)
+            side, level, stop, target = entry_candidate(
+                limits, central_zone, close[i - 1], close[i]
+            )
+
+        loss = entry_loss_percent(side, level, stop) if side else np.nan
+
+        if records is not None:
+            records[i] = (
+                percent_from_extreme,
+                -1 if central_zone is None else central_zone,
+                side,
+                loss,
+                level,
+                stop,
+                target,
+                in_position,
+                False
+            )
+
+            if in_position or percent_from_extreme < min_percent_from_extreme:
                 continue
 
-            if c > o:  # candle de alta
-                body_low = o
-                body_high = c
-                target_array = activity_up
-            else:      # candle de baixa
-                body_low = c
-                body_high = o
-                target_array = activity_down
+        if side == 0:
+            continue
 
-            if body_low <= 0:
-                continue  # proteção (equivalente implícito do Pine)
+        entry_price = level
+        stop_price = stop
+        target_price = target
 
-            for z in range(TOTAL_ZONES):
-                lim_inf = limits[z]
-                lim_sup = limits[z + 1]
+        if max_loss_percent and loss > max_loss_percent:
+            continue
 
-                inter_low = max(body_low, lim_inf)
-                inter_high = min(body_high, lim_sup)
+        if side > 0:
+            entries_long[i] = True
+            in_long = True
+        else:
+            entries_short[i] = True
+            in_short = True
 
-                if inter_high > inter_low:
-                    amp = (inter_high - inter_low) / body_low * 100.0
-                    target_array[z] += amp
+        if records is not None:
+            records["accepted"][i] = True
 
-        activity_total = activity_up + activity_down
+    resolve_conflicts(entries_long, exits_long, entries_short, exits_short)
 
-        # ====================================================
-        # Seleção Pine-like das zonas
-        # ====================================================
-        top_zones = select_top_n(activity_total, TOP_ACTIVE)
+    result = (entries_long, exits_long, entries_short, exits_short)
 
-        if TOP_ACTIVE != 3 or not zones_in_sequence(top_zones):
-            continue
+    if exit_prices is not None:
+        result += (exit_prices,)
 
-        central_zone = sorted(top_zones)[1]
-        bottom_zones = select_bottom_n(activity_total, BOTTOM_ACTIVE)
+    if records is not None:
+        result += (records,)
 
-        # ====================================================
-        # LONG
-        # ====================================================
-        if central_zone + TARGET_LONG_OFFSET < TOTAL_ZONES:
-            level = limits[central_zone + 1]
-            crossed_up = close[i - 1] <= level and close[i] > level
-
-            if crossed_up:
-                entry_price = level
-                stop_price = (limits[central_zone] + level) / 2
-                target_price = limits[central_zone + TARGET_LONG_OFFSET]
-
-                if max_loss_percent:
-                    loss = (entry_price - stop_price) / entry_price * 100.0
-                    if loss > max_loss_percent:
-                        continue
-
-                entries_long[i] = True
-                in_long = True
-                continue
+    if return_position:
+        result += (
+            Position(
+                1 if in_long else -1,
+                entry_price,
+                stop_price,
+                target_price
+            )
+            if in_long or in_short else None,
+        )
 
-        # ====================================================
-        # SHORT
-        # ====================================================
-        if central_zone - TARGET_SHORT_OFFSET >= 0:
-            level = limits[central_zone]
-            crossed_down = close[i - 1] >= level and close[i] < level
-
-            if crossed_down:
-                entry_price = level
-                stop_price = (limits[central_zone] + limits[central_zone + 1]) / 2
-                target_price = limits[central_zone - TARGET_SHORT_OFFSET]
-
-                if max_loss_percent:
-                    loss = (stop_price - entry_price) / entry_price * 100.0
-                    if loss > max_loss_percent:
-                        continue
-
-                entries_short[i] = True
-                in_short = True
-                continue
+    return result
 
-    # ====================================================
-    # Conflitos
-    # ====================================================
-    exits_long |= entries_short
-    exits_short |= entries_long
 
-    conflict = entries_long & entries_short
-    entries_long[conflict] = False
-    entries_short[conflict] = False
-    exits_long[conflict] = False
-    exits_short[conflict] = False
+def log_zones_activity_streaming(
+    open_,
+    high,
+    low,
+    close,
+    state=None,
+    lookback=200,
+    **kwargs
+):
+    """
+    Um bloco do histórico (ex.: um mês). Os arrays começam com as últimas
+    `lookback - 1` barras do bloco anterior (só contexto da janela; nelas
+    nunca há sinais) e `state` é a posição aberta que veio dele.
+
+    Retorna os mesmos itens de `log_zones_activity_strategy` e, por
+    último, o estado para o próximo bloco. Encadeados, os blocos dão
+    exatamente os sinais de uma única execução sobre o histórico todo.
+    """
+    return log_zones_activity_strategy(
+        open_,
+        high,
+        low,
+        close,
+        lookback=lookback,
+        position=state,
+        return_position=True,
+        **kwargs
+    )
+
+
+# ============================================================
+# Candidatos por barra (grids de parâmetros)
+# ============================================================
+
+# Tudo que a estratégia calcula numa barra antes de aplicar os limiares
+# `min_percent_from_extreme` e `max_loss_percent`.
+CANDIDATE_DTYPE = np.dtype([
+    ("index", np.int64),
+    ("side", np.int8),
+    ("percent_from_extreme", np.float64),
+    ("loss_percent", np.float64),
+    ("entry", np.float64),
+    ("stop", np.float64),
+    ("target", np.float64),
+    ("exit", np.int64),     # barra que toca stop ou alvo (-1: nenhuma)
+])
+
+# Primeiro bloco da busca pela saída; dobra a cada bloco sem toque
+EXIT_SEARCH_BLOCK = 64
+
+
+def first_exit_bar(high, low, i, side, stop, target):
+    """
+    Primeira barra depois de `i` que toca o stop ou o alvo (-1 se
+    nenhuma). A busca avança em blocos crescentes, então custa o tamanho
+    do trade, não o resto da série.
+    """
+    n = len(high)
+    start = i + 1
+    block = EXIT_SEARCH_BLOCK
+
+    while start < n:
+        end = min(start + block, n)
+        if side > 0:
+            hit = (low[start:end] <= stop) | (high[start:end] >= target)
+        else:
+            hit = (high[start:end] >= stop) | (low[start:end] <= target)
+
+        if hit.any():
+            return start + int(np.argmax(hit))
+
+        start = end
+        block *= 2
+
+    return -1
+
+
+def bar_candidates(open_, high, low, close, lookback=200, gaps=None):
+    """
+    Entradas candidatas independentes dos limiares: barras em que o close
+    cruza a zona central, com o % desde o último extremo e a perda até o
+    stop. Calculado uma única vez; cada combinação de parâmetros depois é
+    só comparação (ver `refilter_records` e `signals_from_candidates`).
+    """
+    # Sem nenhuma entrada aceita, toda barra é avaliada "sem posição"
+    records = log_zones_activity_strategy(
+        open_,
+        high,
+        low,
+        close,
+        lookback=lookback,
+        min_percent_from_extreme=np.inf,
+        return_records=True,
+        gaps=gaps
+    )[-1]
+
+    index = np.flatnonzero(records["side"] != 0)
+    chosen = records[index]
+
+    candidates = np.zeros(len(index), dtype=CANDIDATE_DTYPE)
+    candidates["index"] = index
+    candidates["side"] = chosen["side"]
+    candidates["percent_from_extreme"] = chosen["percent_from_extreme"]
+    candidates["loss_percent"] = chosen["loss_percent"]
+    candidates["entry"] = chosen["entry"]
+    candidates["stop"] = chosen["stop"]
+    candidates["target"] = chosen["target"]
+
+    # A saída só depende do próprio candidato: calculada uma vez e
+    # reaproveitada por todos os conjuntos de sinais
+    candidates["exit"] = [
+        first_exit_bar(high, low, i, side, stop, target)
+        for i, side, stop, target in zip(
+            index, chosen["side"], chosen["stop"], chosen["target"]
+        )
+    ]
+
+    return candidates
+
+
+def signals_from_candidates(candidates, high, low, accepted):
+    """
+    Reproduz a máquina de estados da estratégia só sobre os candidatos
+    aceitos: cada saída é a primeira barra que toca stop ou alvo
+    (`exit`, já calculada em `bar_candidates`), e a próxima entrada é o
+    próximo candidato a partir dela.
+    """
+    n = len(high)
+
+    entries_long = np.zeros(n, dtype=bool)
+    exits_long = np.zeros(n, dtype=bool)
+    entries_short = np.zeros(n, dtype=bool)
+    exits_short = np.zeros(n, dtype=bool)
+
+    chosen = candidates[accepted]
+    index = chosen["index"]
+
+    k = 0
+    while k < len(chosen):
+        i = int(index[k])
+        exit_bar = int(chosen["exit"][k])
+
+        if chosen["side"][k] > 0:
+            entries_long[i] = True
+            exits = exits_long
+        else:
+            entries_short[i] = True
+            exits = exits_short
+
+        if exit_bar < 0:
+            break
+
+        exits[exit_bar] = True
+
+        k = int(np.searchsorted(index, exit_bar, side="left"))
+
+    resolve_conflicts(entries_long, exits_long, entries_short, exits_short)
 
     return entries_long, exits_long, entries_short, exits_short
 
 
+def log_zones_activity_batched(
+    open_,
+    high,
+    low,
+    close,
+    param_sets,
+    lookback=200,
+    max_loss_percent=None,
+    min_percent_from_extreme=55.0,
+    gaps=None
+):
+    """
+    Sinais de várias combinações de `max_loss_percent` /
+    `min_percent_from_extreme` (`param_sets`, dicts que sobrescrevem os
+    valores acima) com uma única passada da estratégia:
+
+      1. `bar_candidates` calcula as entradas candidatas uma vez;
+      2. os conjuntos aceitos de todas as combinações saem de uma
+         comparação com broadcast;
+      3. combinações com o mesmo conjunto aceito geram os mesmos sinais,
+         então só os conjuntos distintos são reproduzidos.
+
+    Retorna as quatro matrizes (barras x conjuntos distintos) e a coluna
+    de cada combinação.
+    """
+    candidates = bar_candidates(
+        open_, high, low, close, lookback=lookback, gaps=gaps
+    )
+
+    # max_loss None/0 desativa o filtro, como na estratégia
+    max_losses = np.array([
+        params.get("max_loss_percent", max_loss_percent) or np.inf
+        for params in param_sets
+    ], dtype=float)
+    min_extremes = np.array([
+        params.get("min_percent_from_extreme", min_percent_from_extreme)
+        for params in param_sets
+    ], dtype=float)
+
+    accepted = (
+        (candidates["percent_from_extreme"][None, :] >= min_extremes[:, None])
+        & (candidates["loss_percent"][None, :] <= max_losses[:, None])
+    )
+
+    unique_sets, columns = np.unique(accepted, axis=0, return_inverse=True)
+
+    signals = [
+        signals_from_candidates(candidates, high, low, mask)
+        for mask in unique_sets
+    ]
+    matrices = tuple(
+        np.column_stack([col[k] for col in signals])
+        for k in range(4)
+    )
+
+    return (*matrices, columns.reshape(-1))
+
+
 def backtest_strategy(
     data,
     lookback=200,
@@ -270,3 +801,58 @@ def backtest_strategy(
         max_loss_percent=max_loss_percent,
         min_percent_from_extreme=min_percent_from_extreme
     )
+
+# ============================================================
+# Registro (strategy/registry.py)
+# ============================================================
+
+def strategy_params(strategy_cfg):
+    """
+    kwargs de `log_zones_activity_strategy` a partir do config.yaml.
+
+    Zonas e alvos são constantes do módulo, lidas do config.yaml da
+    estratégia no import; outro config (`--strategy-config`) só pode
+    mudar os parâmetros abaixo, então divergências nelas são rejeitadas.
+    """
+    for key in ("zones", "targets"):
+        if strategy_cfg.get(key, STRATEGY_CFG[key]) != STRATEGY_CFG[key]:
+            raise ValueError(
+                f"Strategy config '{key}' ({strategy_cfg[key]}) differs "
+                f"from {CONFIG_PATH} ({STRATEGY_CFG[key]}); zones and "
+                "targets can only be changed in that file"
+            )
+
+    return {
+        "lookback": strategy_cfg.get("lookback_candles", 200),
+        "max_loss_percent": strategy_cfg.get("max_loss_percent", None),
+        "min_percent_from_extreme": (
+            strategy_cfg["activity"]["min_percent_from_extreme"]
+        ),
+    }
+
+
+STRATEGY = Strategy(
+    name="accumulation_zone",
+    config_path=CONFIG_PATH,
+    params=strategy_params,
+    param_space=(
+        Param(
+            "max_loss_percent",
+            "MaxLoss",
+            (1.0, 1.5, 2.0, 2.5, 3.0, 5.0),
+            "%"
+        ),
+        Param(
+            "min_percent_from_extreme",
+            "MinExtreme",
+            (40.0, 45.0, 50.0, 55.0),
+            "%"
+        ),
+    ),
+    warmup=lambda params: params["lookback"],
+    signals=log_zones_activity_strategy,
+    features=frozenset({"intrabar", "records", "gaps"}),
+    batched=log_zones_activity_batched,
+    streaming=log_zones_activity_streaming,
+    version=1,
+)
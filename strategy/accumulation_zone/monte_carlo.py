@@ -0,0 +1,327 @@
+# strategy/accumulation_zone/monte_carlo.py
+#
+# Monte Carlo / bootstrap robustness over the scanner's monthly results.
+#
+# Reads the per-month returns and per-trade returns produced by the scanner
+# (see `scanning.compute_month_results`, cached on disk) and simulates
+# thousands of alternative paths for every parameter combination:
+#
+#   bootstrap -> months drawn with replacement
+#   shuffle   -> trade order shuffled inside each month (monthly risk rules
+#                and leverage re-applied) and month order permuted
+#
+# Everything is a (simulations x months) NumPy computation.
+
+import os
+import sys
+import argparse
+
+# ============================================================
+# Ajuste de import para raiz do projeto
+# ============================================================
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(PROJECT_ROOT)
+
+from executor import load_yaml
+from strategy.accumulation_zone.scanning import (
+    GLOBAL_CONFIG_PATH,
+    load_settings,
+    compute_month_results,
+)
+
+METHODS = ("bootstrap", "shuffle")
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+def load_monte_carlo_config(strategy_config_path: str) -> dict:
+    cfg = load_yaml(strategy_config_path)["strategy"].get("monte_carlo", {})
+
+    return {
+        "simulations": int(cfg.get("simulations", 10000)),
+        "method": cfg.get("method", "shuffle"),
+        "ruin_drawdown": float(cfg.get("ruin_drawdown", -50.0)),
+        "seed": cfg.get("seed", None),
+    }
+
+# ============================================================
+# RISK RULES (VECTORIZED)
+# ============================================================
+
+def monthly_risk_returns(trade_returns, settings: dict):
+    """
+    Versão vetorizada de `apply_monthly_risk_management`.
+
+    `trade_returns` é uma matriz (simulações x trades) com o retorno % de
+    cada trade (já alavancado), todas do mesmo mês. Retorna o retorno do
+    mês (fração) de cada simulação.
+    """
+    import numpy as np
+
+    n_sims, n_trades = trade_returns.shape
+    if n_trades == 0:
+        return np.zeros(n_sims)
+
+    cumulative = np.cumsum(trade_returns, axis=1)
+    trades_taken = np.arange(1, n_trades + 1)
+
+    stop = cumulative <= settings["max_monthly_drawdown"]
+    stop |= trades_taken >= settings["max_recovery_trades"]
+
+    if settings["monthly_profit_target"] is not None:
+        stop |= cumulative >= settings["monthly_profit_target"]
+
+    if settings["min_first_trade_profit"] is not None:
+        first = trade_returns[:, 0]
+        stop[:, 0] |= (first > 0) & (first >= settings["min_first_trade_profit"])
+
+    # Sem regra disparada, o mês termina no último trade
+    last = np.where(stop.any(axis=1), np.argmax(stop, axis=1), n_trades - 1)
+
+    return cumulative[np.arange(n_sims), last] / 100.0
+
+# ============================================================
+# SIMULATION
+# ============================================================
+
+def simulate_paths(
+    month_returns,
+    month_trades,
+    settings: dict,
+    simulations: int,
+    method: str,
+    rng
+):
+    """
+    Matriz (simulações x meses) de retornos mensais reamostrados.
+
+    `month_returns` é o caminho original (um retorno por mês) e
+    `month_trades` a lista com os retornos % dos trades de cada mês.
+    """
+    import numpy as np
+
+    month_returns = np.asarray(month_returns, dtype=float)
+    n_months = len(month_returns)
+
+    if method == "bootstrap":
+        picks = rng.integers(0, n_months, size=(simulations, n_months))
+        return month_returns[picks]
+
+    if method != "shuffle":
+        raise ValueError(f"Unknown Monte Carlo method: '{method}'")
+
+    paths = np.repeat(month_returns[None, :], simulations, axis=0)
+
+    # Sem gestão de risco, a ordem dos trades não muda o mês
+    if settings["risk_enabled"]:
+        for m, trades in enumerate(month_trades):
+            if len(trades) < 2:
+                continue
+            order = np.argsort(rng.random((simulations, len(trades))), axis=1)
+            paths[:, m] = np.maximum(
+                monthly_risk_returns(np.asarray(trades)[order], settings),
+                -1.0
+            )
+
+    month_order = np.argsort(rng.random((simulations, n_months)), axis=1)
+    return np.take_along_axis(paths, month_order, axis=1)
+
+
+def path_statistics(paths, initial_balance: float, ruin_drawdown: float):
+    """Capital final, drawdown máximo e ruína de cada simulação."""
+    import numpy as np
+
+    equity = initial_balance * np.cumprod(1 + paths, axis=1)
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), initial_balance)
+    drawdown = (equity / peaks - 1) * 100
+
+    max_drawdown = drawdown.min(axis=1)
+    final_return = (equity[:, -1] / initial_balance - 1) * 100
+    ruined = max_drawdown <= ruin_drawdown
+
+    return final_return, max_drawdown, ruined
+
+
+def summarize(final_return, max_drawdown, ruined) -> dict:
+    import numpy as np
+
+    row = {}
+    for p, value in zip(PERCENTILES, np.percentile(final_return, PERCENTILES)):
+        row[f"Return_p{p}"] = round(value, 2)
+    for p, value in zip(PERCENTILES, np.percentile(max_drawdown, PERCENTILES)):
+        row[f"MaxDD_p{p}"] = round(value, 2)
+
+    row["ProbLoss"] = round(float(np.mean(final_return < 0)) * 100, 2)
+    row["ProbRuin"] = round(float(np.mean(ruined)) * 100, 2)
+    return row
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def run(
+    config_path: str = GLOBAL_CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    simulations: int | None = None,
+    method: str | None = None,
+    strategy_name: str | None = None
+):
+    import numpy as np
+    import pandas as pd
+
+    from market_data import iter_months
+    from strategy.registry import label_params, param_grid
+
+    settings = load_settings(config_path, strategy_config_path, strategy_name)
+    strategy = settings["strategy"]
+    mc_cfg = load_monte_carlo_config(settings["strategy_config_path"])
+
+    simulations = simulations or mc_cfg["simulations"]
+    method = method or mc_cfg["method"]
+    rng = np.random.default_rng(mc_cfg["seed"])
+
+    initial_balance = settings["initial_balance"]
+    output_folder = settings["output_folder"]
+    os.makedirs(output_folder, exist_ok=True)
+
+    months = list(iter_months(
+        settings["start_year"],
+        settings["start_month"],
+        settings["end_year"],
+        settings["end_month"]
+    ))
+    combos = param_grid(strategy)
+    names = list(combos[0])
+    param_header = "".join(
+        f"{param.label:>10} " for param in strategy.param_space
+    )
+
+    for symbol in settings["symbols"]:
+        for timeframe in settings["timeframes"]:
+            print(
+                f"\n🎲 MONTE CARLO | {symbol} | TF={timeframe} "
+                f"| {method} | sims={simulations}\n"
+            )
+
+            results = compute_month_results(
+                symbol, timeframe, months, combos, settings
+            )
+            results = results.set_index(
+                [*names, "year", "month"]
+            ).sort_index()
+
+            header = (
+                f"{param_header}{'Ret p5':>9} {'Ret p50':>9} "
+                f"{'DD p5':>9} {'Ruin%':>7}"
+            )
+            print(header)
+            print("-" * len(header))
+
+            rows = []
+            for combo in combos:
+                combo_results = results.loc[tuple(combo.values())]
+                labels = label_params(strategy, combo)
+
+                paths = simulate_paths(
+                    combo_results["month_return"].values,
+                    list(combo_results["trade_returns"]),
+                    settings,
+                    simulations,
+                    method,
+                    rng
+                )
+                row = summarize(*path_statistics(
+                    paths,
+                    initial_balance,
+                    mc_cfg["ruin_drawdown"]
+                ))
+
+                values = "".join(f"{value:>10} " for value in labels.values())
+                print(
+                    f"{values}"
+                    f"{row['Return_p5']:>8.2f}% {row['Return_p50']:>8.2f}% "
+                    f"{row['MaxDD_p5']:>8.2f}% {row['ProbRuin']:>6.2f}%"
+                )
+
+                rows.append({
+                    "Pair": symbol,
+                    "TF": timeframe,
+                    **labels,
+                    "Method": method,
+                    "Simulations": simulations,
+                    **row
+                })
+
+            filename = (
+                f"{symbol.replace('/', '')}_"
+                f"{settings['start_month']}_{settings['start_year']}_"
+                f"{settings['end_month']}_{settings['end_year']}_"
+                f"{timeframe}_montecarlo_{method}.xlsx"
+            )
+            full_path = os.path.join(output_folder, filename)
+
+            pd.DataFrame(rows).to_excel(
+                full_path,
+                index=False,
+                sheet_name="summary"
+            )
+
+            print(f"\n📊 Monte Carlo generated: {full_path}\n")
+
+# ============================================================
+# ENTRY POINT
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Bootstrap / shuffled-order robustness over the "
+                    "scanner's monthly results."
+    )
+    parser.add_argument(
+        "--config",
+        default=GLOBAL_CONFIG_PATH,
+        help="global config file (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help="strategy folder under strategy/ (default: the `strategy` "
+             "key of the global config)"
+    )
+    parser.add_argument(
+        "--strategy-config",
+        default=None,
+        help="strategy config file (default: the strategy's config.yaml)"
+    )
+    parser.add_argument(
+        "--simulations",
+        type=int,
+        default=None,
+        help="paths per combo (default: monte_carlo.simulations)"
+    )
+    parser.add_argument(
+        "--method",
+        choices=METHODS,
+        default=None,
+        help="resampling method (default: monte_carlo.method)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    run(
+        args.config,
+        args.strategy_config,
+        simulations=args.simulations,
+        method=args.method,
+        strategy_name=args.strategy
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,11 +2,7 @@
 
 import os
 import sys
-import pandas as pd
-import itertools
-from tqdm import tqdm
-import vectorbt as vbt
-import yaml
+import argparse
 
 # ============================================================
 # Ajuste de import para raiz do projeto
@@ -15,138 +11,117 @@ import yaml
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
 sys.path.append(PROJECT_ROOT)
 
-from exchange import get_exchange
-from strategy.accumulation_zone.accumulation_zone import (
-    log_zones_activity_strategy
-)
+from executor import load_yaml
 
 # ============================================================
-# LOAD GLOBAL CONFIG
+# PATHS
 # ============================================================
 
-BASE_DIR = os.path.dirname(__file__)
-
 GLOBAL_CONFIG_PATH = os.path.join(PROJECT_ROOT, "config.yaml")
-with open(GLOBAL_CONFIG_PATH, "r", encoding="utf-8") as f:
-    global_config = yaml.safe_load(f)
-
-SYMBOLS = global_config["symbols"]
-TIMEFRAMES = global_config["timeframes"]
-INITIAL_BALANCE = global_config["execution"].get("initial_balance", 1000.0)
-
-date_cfg = global_config["date_range"]
-START_YEAR = date_cfg["start_year"]
-START_MONTH = date_cfg["start_month"]
-END_YEAR = date_cfg["end_year"]
-END_MONTH = date_cfg["end_month"]
-
-OUTPUT_FOLDER = os.path.join(PROJECT_ROOT, global_config["output"]["folder"])
-os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-
-# ============================================================
-# LOAD STRATEGY CONFIG
-# ============================================================
-
-STRATEGY_CONFIG_PATH = os.path.join(BASE_DIR, "config.yaml")
-with open(STRATEGY_CONFIG_PATH, "r", encoding="utf-8") as f:
-    strategy_config = yaml.safe_load(f)
-
-strategy_params = strategy_config["strategy"]
-
-LOOKBACK = strategy_params.get("lookback_candles", 200)
-
-# ----------------------------
-# RISK MANAGEMENT (MONTHLY)
-# ----------------------------
-
-risk_cfg = strategy_params.get("risk_management", {})
-
-RISK_ENABLED = risk_cfg.get("enabled", False)
-MAX_MONTHLY_DRAWDOWN = float(risk_cfg.get("max_monthly_drawdown", -3.0))
-MAX_RECOVERY_TRADES = int(risk_cfg.get("max_recovery_trades", 2))
-MONTHLY_PROFIT_TARGET = risk_cfg.get("monthly_profit_target", None)
-
-MONTHLY_PROFIT_TARGET = (
-    float(MONTHLY_PROFIT_TARGET)
-    if MONTHLY_PROFIT_TARGET is not None
-    else None
-)
-
-MIN_FIRST_TRADE_PROFIT = risk_cfg.get("min_first_trade_profit", 0.0)
-MIN_FIRST_TRADE_PROFIT = (
-    float(MIN_FIRST_TRADE_PROFIT)
-    if MIN_FIRST_TRADE_PROFIT is not None
-    else None
-)
 
-# ----------------------------
-# LEVERAGE
-# ----------------------------
-
-leverage_cfg = strategy_params.get("leverage", {})
-
-LEVERAGE_ENABLED = leverage_cfg.get("enabled", False)
-LEVERAGE_VALUE = float(leverage_cfg.get("value", 1.0))
-
-# ============================================================
-# GRID SEARCH
 # ============================================================
-
-MAX_LOSS_VALUES = [1.0, 1.5, 2.0, 2.5, 3.0, 5.0]
-MIN_PERCENT_EXTREME_VALUES = [40.0, 45.0, 50.0, 55.0]
-
-# ============================================================
-# EXCHANGE
+# LOAD CONFIG
 # ============================================================
 
-exchange = get_exchange()
+def _optional_float(value):
+    return float(value) if value is not None else None
+
+
+def load_settings(
+    config_path: str = GLOBAL_CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    strategy_name: str | None = None
+) -> dict:
+    """
+    A estratégia vem de `strategy_name` ou da chave global `strategy:`
+    (ver `strategy/registry.py`); o grid varrido é o `param_space` dela.
+    """
+    from strategy.registry import get_strategy
+
+    global_config = load_yaml(config_path)
+    strategy = get_strategy(strategy_name or global_config.get("strategy"))
+    strategy_config_path = strategy_config_path or strategy.config_path
+    strategy_params = load_yaml(strategy_config_path)["strategy"]
+    params = strategy.params(strategy_params)
+
+    date_cfg = global_config["date_range"]
+
+    # ----------------------------
+    # RISK MANAGEMENT (MONTHLY)
+    # ----------------------------
+    risk_cfg = strategy_params.get("risk_management", {})
+
+    # ----------------------------
+    # LEVERAGE
+    # ----------------------------
+    leverage_cfg = strategy_params.get("leverage", {})
+
+    # ----------------------------
+    # WALK-FORWARD
+    # ----------------------------
+    walk_forward_cfg = strategy_params.get("walk_forward", {})
+
+    return {
+        "strategy": strategy,
+        "params": params,
+        "warmup": strategy.warmup(params),
+        "exchange": global_config["exchange"],
+        "symbols": global_config["symbols"],
+        "timeframes": global_config["timeframes"],
+        "data": global_config.get("data", {}),
+        "initial_balance": (
+            global_config["execution"].get("initial_balance", 1000.0)
+        ),
+        "start_year": date_cfg["start_year"],
+        "start_month": date_cfg["start_month"],
+        "end_year": date_cfg["end_year"],
+        "end_month": date_cfg["end_month"],
+        "output_folder": os.path.join(
+            PROJECT_ROOT,
+            global_config["output"]["folder"]
+        ),
+        "risk_enabled": risk_cfg.get("enabled", False),
+        "max_monthly_drawdown": (
+            float(risk_cfg.get("max_monthly_drawdown", -3.0))
+        ),
+        "max_recovery_trades": int(risk_cfg.get("max_recovery_trades", 2)),
+        "monthly_profit_target": _optional_float(
+            risk_cfg.get("monthly_profit_target", None)
+        ),
+        "min_first_trade_profit": _optional_float(
+            risk_cfg.get("min_first_trade_profit", 0.0)
+        ),
+        "leverage_enabled": leverage_cfg.get("enabled", False),
+        "leverage_value": float(leverage_cfg.get("value", 1.0)),
+        "walk_forward": {
+            "train_months": int(walk_forward_cfg.get("train_months", 12)),
+            "test_months": int(walk_forward_cfg.get("test_months", 1)),
+        },
+        "strategy_config_path": strategy_config_path,
+    }
 
 # ============================================================
 # HELPERS
 # ============================================================
 
-def fetch_ohlcv_year(symbol: str, timeframe: str, year: int) -> pd.DataFrame:
-    start = pd.Timestamp(year=year, month=1, day=1)
-    end = pd.Timestamp(year=year, month=12, day=31, hour=23, minute=59)
-
-    since = int(start.timestamp() * 1000)
-    end_ts = int(end.timestamp() * 1000)
-
-    ohlcv = []
-
-    with tqdm(
-        desc=f"Downloading {symbol} {timeframe} {year}",
-        unit="batch",
-        leave=False
-    ) as pbar:
-        while since < end_ts:
-            batch = exchange.fetch_ohlcv(
-                symbol=symbol,
-                timeframe=timeframe,
-                since=since,
-                limit=1000
-            )
-            if not batch:
-                break
-            ohlcv.extend(batch)
-            since = batch[-1][0] + 1
-            pbar.update(1)
-
-    if not ohlcv:
-        return pd.DataFrame()
-
-    df = pd.DataFrame(
-        ohlcv,
-        columns=["timestamp", "open", "high", "low", "close", "volume"]
+def fetch_ohlcv_year(symbol: str, timeframe: str, year: int, settings: dict):
+    """Candles de um ano inteiro, vindos do cache mensal local."""
+    from market_data import load_ohlcv, resolve_base_timeframe
+
+    return load_ohlcv(
+        symbol,
+        timeframe,
+        (year, 1),
+        (year, 12),
+        settings["exchange"],
+        settings["data"],
+        resolve_base_timeframe(settings["timeframes"], settings["data"])
     )
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-    df.set_index("timestamp", inplace=True)
-    df.index = df.index.tz_convert(None)
-
-    return df.loc[df.index.year == year]
 
 
 def build_month_ranges(year: int):
+    import pandas as pd
+
     return [
         (
             pd.Timestamp(year, m, 1),
@@ -159,16 +134,33 @@ def build_month_ranges(year: int):
 # RISK MANAGEMENT (MONTHLY)
 # ============================================================
 
-def apply_monthly_risk_management(trades: pd.DataFrame) -> float:
-    cumulative = 0.0
-    trades_taken = 0
+def trade_returns_pct(trades, settings: dict):
+    """Retorno de cada trade em % (com alavancagem, se ativa)."""
+    import numpy as np
+
+    if trades is None or trades.empty:
+        return np.empty(0)
+
+    returns = (
+        trades["pnl"].values / trades["entry_price"].values
+    ) * 100
+
+    if settings["leverage_enabled"]:
+        returns = returns * settings["leverage_value"]
 
-    for _, trade in trades.iterrows():
-        trade_return = (trade["pnl"] / trade["entry_price"]) * 100
+    return returns
 
-        if LEVERAGE_ENABLED:
-            trade_return *= LEVERAGE_VALUE
 
+def apply_monthly_risk_management(trades, settings: dict) -> float:
+    return risk_managed_return(trade_returns_pct(trades, settings), settings)
+
+
+def risk_managed_return(trade_returns, settings: dict) -> float:
+    """Regras mensais aplicadas aos retornos % dos trades, em ordem."""
+    cumulative = 0.0
+    trades_taken = 0
+
+    for trade_return in trade_returns:
         trades_taken += 1
         cumulative += trade_return
 
@@ -178,69 +170,193 @@ def apply_monthly_risk_management(trades: pd.DataFrame) -> float:
         if (
             trades_taken == 1
             and trade_return > 0
-            and MIN_FIRST_TRADE_PROFIT is not None
-            and trade_return >= MIN_FIRST_TRADE_PROFIT
+            and settings["min_first_trade_profit"] is not None
+            and trade_return >= settings["min_first_trade_profit"]
         ):
             break
 
         # ----------------------------------------------------
         # Regra 2: estourou drawdown mensal
         # ----------------------------------------------------
-        if cumulative <= MAX_MONTHLY_DRAWDOWN:
+        if cumulative <= settings["max_monthly_drawdown"]:
             break
 
         # ----------------------------------------------------
         # Regra 3: atingiu a meta mensal acumulada
         # ----------------------------------------------------
         if (
-            MONTHLY_PROFIT_TARGET is not None
-            and cumulative >= MONTHLY_PROFIT_TARGET
+            settings["monthly_profit_target"] is not None
+            and cumulative >= settings["monthly_profit_target"]
         ):
             break
 
         # ----------------------------------------------------
         # Regra 4: acabaram as tentativas (inclui o 1º trade)
         # ----------------------------------------------------
-        if trades_taken >= MAX_RECOVERY_TRADES:
+        if trades_taken >= settings["max_recovery_trades"]:
             break
 
     return cumulative / 100.0
 
 
-def get_month_return(portfolio, trades) -> float:
+def get_month_return(portfolio, trades, settings: dict) -> float:
     if trades is None or trades.empty:
         return 0.0
 
-    if RISK_ENABLED:
-        return apply_monthly_risk_management(trades)
+    if settings["risk_enabled"]:
+        return apply_monthly_risk_management(trades, settings)
 
     base_return = portfolio.total_return()
 
-    if LEVERAGE_ENABLED:
-        base_return *= LEVERAGE_VALUE
+    if settings["leverage_enabled"]:
+        base_return *= settings["leverage_value"]
 
     return base_return
 
+
+def simulate_month(
+    df_month,
+    combo: dict,
+    capital: float,
+    timeframe: str,
+    settings: dict
+):
+    """
+    Roda estratégia + portfolio de um mês com os parâmetros padrão
+    sobrescritos por `combo`; retorna (retorno, trades).
+    """
+    import vectorbt as vbt
+
+    entries_l, exits_l, entries_s, exits_s = settings["strategy"].signals(
+        df_month["open"].values,
+        df_month["high"].values,
+        df_month["low"].values,
+        df_month["close"].values,
+        **{**settings["params"], **combo}
+    )[:4]
+
+    portfolio = vbt.Portfolio.from_signals(
+        close=df_month["close"],
+        entries=entries_l,
+        exits=exits_l,
+        short_entries=entries_s,
+        short_exits=exits_s,
+        init_cash=capital,
+        size=1.0,
+        freq=timeframe
+    )
+
+    trades = portfolio.trades.records
+    month_return = get_month_return(portfolio, trades, settings)
+
+    return max(month_return, -1.0), trades
+
+
+def simulate_month_grid(
+    df_month,
+    combos: list[dict],
+    capital: float,
+    timeframe: str,
+    settings: dict
+):
+    """
+    Várias combinações no mesmo mês: sinais pelo backend em lote da
+    estratégia (`batched_signals`) e um único portfolio VectorBT com uma
+    coluna por conjunto de sinais distinto.
+
+    Retorna (retornos por combo, retornos % dos trades por combo,
+    nº de colunas simuladas); cada combo bate com `simulate_month`.
+    """
+    import numpy as np
+    import vectorbt as vbt
+
+    from strategy.registry import batched_signals
+
+    entries_l, exits_l, entries_s, exits_s, columns = batched_signals(
+        settings["strategy"],
+        df_month["open"].values,
+        df_month["high"].values,
+        df_month["low"].values,
+        df_month["close"].values,
+        combos,
+        settings["params"]
+    )
+    n_columns = entries_l.shape[1]
+
+    portfolio = vbt.Portfolio.from_signals(
+        close=df_month["close"],
+        entries=entries_l,
+        exits=exits_l,
+        short_entries=entries_s,
+        short_exits=exits_s,
+        init_cash=capital,
+        size=1.0,
+        freq=timeframe
+    )
+
+    records = portfolio.trades.records
+    column_trades = [
+        trade_returns_pct(records[records["col"] == col], settings)
+        for col in range(n_columns)
+    ]
+
+    if settings["risk_enabled"]:
+        column_returns = np.array([
+            risk_managed_return(trades, settings)
+            for trades in column_trades
+        ])
+    else:
+        traded = np.array([len(trades) > 0 for trades in column_trades])
+        column_returns = np.where(
+            traded, portfolio.total_return().values, 0.0
+        )
+        if settings["leverage_enabled"]:
+            column_returns = column_returns * settings["leverage_value"]
+
+    column_returns = np.maximum(column_returns, -1.0)
+
+    return (
+        column_returns[columns],
+        [column_trades[col] for col in columns],
+        n_columns
+    )
+
 # ============================================================
 # MAIN
 # ============================================================
 
-def run():
-    risk_tag = "riskON" if RISK_ENABLED else "riskOFF"
-    lev_tag = f"{LEVERAGE_VALUE}x" if LEVERAGE_ENABLED else "1x"
+def run(
+    config_path: str = GLOBAL_CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    strategy_name: str | None = None
+):
+    import pandas as pd
+
+    from strategy.registry import format_params, param_grid
+
+    settings = load_settings(config_path, strategy_config_path, strategy_name)
+    strategy = settings["strategy"]
 
-    for symbol in SYMBOLS:
-        for timeframe in TIMEFRAMES:
+    initial_balance = settings["initial_balance"]
+    warmup = settings["warmup"]
+    output_folder = settings["output_folder"]
+    os.makedirs(output_folder, exist_ok=True)
+
+    risk_tag = "riskON" if settings["risk_enabled"] else "riskOFF"
+    lev_tag = (
+        f"{settings['leverage_value']}x"
+        if settings["leverage_enabled"] else "1x"
+    )
+
+    for symbol in settings["symbols"]:
+        for timeframe in settings["timeframes"]:
 
             all_rows = []
 
-            for max_loss, min_extreme in itertools.product(
-                MAX_LOSS_VALUES,
-                MIN_PERCENT_EXTREME_VALUES
-            ):
+            for combo in param_grid(strategy):
                 print(
                     f"\n🔹 START | {symbol} | TF={timeframe} "
-                    f"| MaxLoss={max_loss}% | MinExtreme={min_extreme}% "
+                    f"| {format_params(strategy, combo)} "
                     f"| {risk_tag} | Lev={lev_tag}\n"
                 )
 
@@ -250,50 +366,39 @@ def run():
                 )
                 print("-" * 54)
 
-                capital = INITIAL_BALANCE
+                capital = initial_balance
                 rows = []
                 broke_early = False
 
-                for year in range(START_YEAR, END_YEAR + 1):
-                    df_year = fetch_ohlcv_year(symbol, timeframe, year)
+                for year in range(
+                    settings["start_year"],
+                    settings["end_year"] + 1
+                ):
+                    df_year = fetch_ohlcv_year(
+                        symbol,
+                        timeframe,
+                        year,
+                        settings
+                    )
 
-                    if df_year.empty or len(df_year) < LOOKBACK + 20:
+                    if df_year.empty or len(df_year) < warmup + 20:
                         break
 
                     capital_start_year = capital
 
                     for month_start, month_end in build_month_ranges(year):
                         df_month = df_year.loc[month_start:month_end]
-                        if len(df_month) < LOOKBACK + 10:
+                        if len(df_month) < warmup + 10:
                             continue
 
-                        entries_l, exits_l, entries_s, exits_s = (
-                            log_zones_activity_strategy(
-                                open_=df_month["open"].values,
-                                high=df_month["high"].values,
-                                low=df_month["low"].values,
-                                close=df_month["close"].values,
-                                lookback=LOOKBACK,
-                                max_loss_percent=max_loss,
-                                min_percent_from_extreme=min_extreme
-                            )
-                        )
-
-                        portfolio = vbt.Portfolio.from_signals(
-                            close=df_month["close"],
-                            entries=entries_l,
-                            exits=exits_l,
-                            short_entries=entries_s,
-                            short_exits=exits_s,
-                            init_cash=capital,
-                            size=1.0,
-                            freq=timeframe
+                        month_return, _ = simulate_month(
+                            df_month,
+                            combo,
+                            capital,
+                            timeframe,
+                            settings
                         )
 
-                        trades = portfolio.trades.records
-                        month_return = get_month_return(portfolio, trades)
-
-                        month_return = max(month_return, -1.0)
                         capital *= (1 + month_return)
 
                         if capital <= 0:
@@ -306,7 +411,7 @@ def run():
                         if capital_start_year > 0 else -1
                     )
 
-                    total_return = (capital / INITIAL_BALANCE) - 1
+                    total_return = (capital / initial_balance) - 1
                     status = "BROKE" if capital <= 0 else "OK"
 
                     print(
@@ -320,8 +425,10 @@ def run():
                     rows.append({
                         "Pair": symbol,
                         "TF": timeframe,
-                        "MaxLoss": f"{max_loss}%",
-                        "MinExtreme": f"{min_extreme}%",
+                        **{
+                            param.label: f"{combo[param.name]}{param.unit}"
+                            for param in strategy.param_space
+                        },
                         "Risk": risk_tag,
                         "Leverage": lev_tag,
                         "Year": year,
@@ -335,7 +442,7 @@ def run():
                     if broke_early:
                         break
 
-                status = "SURVIVED" if capital >= INITIAL_BALANCE else "BROKE"
+                status = "SURVIVED" if capital >= initial_balance else "BROKE"
                 rows[-1]["FinalCapital"] = round(capital, 2)
                 rows[-1]["Status"] = status
 
@@ -346,21 +453,462 @@ def run():
             symbol_clean = symbol.replace("/", "")
             filename = (
                 f"{symbol_clean}_"
-                f"{START_MONTH}_{START_YEAR}_"
-                f"{END_MONTH}_{END_YEAR}_"
+                f"{settings['start_month']}_{settings['start_year']}_"
+                f"{settings['end_month']}_{settings['end_year']}_"
                 f"{risk_tag}_{lev_tag}_scanning.xlsx"
             )
 
-            full_path = os.path.join(OUTPUT_FOLDER, filename)
+            full_path = os.path.join(output_folder, filename)
 
             with pd.ExcelWriter(full_path, engine="openpyxl") as writer:
                 df_out.to_excel(writer, index=False, sheet_name="results")
 
             print(f"\n📊 Scanning generated: {full_path}\n")
 
+# ============================================================
+# WALK-FORWARD
+# ============================================================
+
+# Versão da simulação mensal (`simulate_month_grid` e regras de risco);
+# aumentar quando ela mudar invalida os resultados em cache
+MONTH_RESULTS_VERSION = 1
+
+
+def result_columns(combos: list[dict]) -> list[str]:
+    """
+    Colunas dos resultados mensais: um eixo por parâmetro do grid e a
+    versão dos candles do mês usados (`market_data.month_fingerprint`).
+    """
+    return [
+        "year", "month", *combos[0],
+        "month_return", "trade_returns", "data_key",
+    ]
+
+
+def month_results_path(symbol: str, timeframe: str, settings: dict) -> str:
+    """
+    Arquivo de resultados mensais por combo. A chave inclui a estratégia
+    (e `Strategy.version`), o conteúdo dos configs dela, as regras de
+    risco/alavancagem, a configuração dos dados e
+    `MONTH_RESULTS_VERSION`, então qualquer mudança neles gera um arquivo
+    novo. Mudanças nos candles de um mês são tratadas por linha (ver
+    `compute_month_results`).
+    """
+    import hashlib
+    import json
+
+    from market_data import BASE_DIR as DATA_BASE_DIR
+    from market_data import resolve_base_timeframe
+
+    strategy = settings["strategy"]
+
+    digest = hashlib.sha1()
+    config_paths = {strategy.config_path, settings["strategy_config_path"]}
+    for path in sorted(config_paths):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+
+    digest.update(json.dumps(
+        {
+            "strategy": strategy.name,
+            "strategy_version": strategy.version,
+            "results_version": MONTH_RESULTS_VERSION,
+            "data": settings["data"],
+            "base_timeframe": resolve_base_timeframe(
+                settings["timeframes"], settings["data"]
+            ),
+            **{
+                key: settings[key]
+                for key in (
+                    "params", "exchange", "initial_balance",
+                    "risk_enabled", "max_monthly_drawdown",
+                    "max_recovery_trades", "monthly_profit_target",
+                    "min_first_trade_profit", "leverage_enabled",
+                    "leverage_value",
+                )
+            },
+        },
+        sort_keys=True
+    ).encode())
+
+    return os.path.join(
+        DATA_BASE_DIR,
+        settings["data"].get("cache_folder", "cache"),
+        "scanning",
+        f"{symbol.replace('/', '')}_{timeframe}_{digest.hexdigest()[:12]}.pkl"
+    )
+
+
+def compute_month_results(
+    symbol: str,
+    timeframe: str,
+    months: list[tuple[int, int]],
+    combos: list[dict],
+    settings: dict
+):
+    """
+    Resultado de cada (mês, combo), simulado com `initial_balance`.
+
+    Os combos que faltam num mês são simulados juntos
+    (`simulate_month_grid`). Os resultados de meses fechados ficam em
+    disco: janelas que se sobrepõem (e execuções futuras) só simulam o
+    que ainda falta. Cada linha guarda a versão dos candles do mês; se o
+    arquivo do mês no cache foi regravado (ex.: `repair_gaps`), o mês é
+    simulado de novo.
+
+    Limitação: com `size=1.0` (uma unidade do ativo) o retorno do mês
+    depende do capital quando `risk_management.enabled` é false, então
+    compor estes retornos (walk-forward, Monte Carlo, sensibilidade) não
+    reproduz o `run()`, que simula cada mês com o capital acumulado. Com
+    a gestão de risco ativa o retorno vem dos trades e não depende dele.
+    """
+    import pandas as pd
+
+    from market_data import (
+        load_ohlcv,
+        month_fingerprint,
+        month_is_closed,
+        resolve_base_timeframe,
+    )
+
+    path = month_results_path(symbol, timeframe, settings)
+    columns = result_columns(combos)
+    names = list(combos[0])
+
+    def load_months():
+        return load_ohlcv(
+            symbol,
+            timeframe,
+            months[0],
+            months[-1],
+            settings["exchange"],
+            settings["data"],
+            resolve_base_timeframe(settings["timeframes"], settings["data"])
+        )
+
+    def fingerprints():
+        return {
+            (year, month): month_fingerprint(
+                symbol, timeframe, year, month,
+                settings["exchange"], settings["data"]
+            )
+            for year, month in months
+        }
+
+    # Com `repair_gaps` os meses podem ser regravados ao carregar
+    df_full = load_months() if settings["data"].get("repair_gaps") else None
+    data_keys = fingerprints()
+
+    if os.path.exists(path):
+        cached = pd.read_pickle(path)
+    else:
+        cached = pd.DataFrame(columns=columns)
+
+    # Linhas calculadas com outra versão dos candles saem do cache
+    current = [
+        data_keys.get((y, m), key) == key
+        for y, m, key in zip(
+            cached["year"], cached["month"], cached["data_key"]
+        )
+    ]
+    cached = cached.loc[current]
+
+    done = set(zip(
+        cached["year"], cached["month"],
+        *(cached[name] for name in names)
+    ))
+
+    missing = [
+        (year, month, todo)
+        for year, month in months
+        if (todo := [
+            combo for combo in combos
+            if (year, month, *combo.values()) not in done
+        ])
+    ]
+
+    if missing:
+        if df_full is None:
+            df_full = load_months()
+            data_keys = fingerprints()
+
+        rows = []
+        for year, month, todo in missing:
+            month_start = pd.Timestamp(year, month, 1)
+            month_end = month_start + pd.offsets.MonthEnd(1)
+            df_month = df_full.loc[month_start:month_end]
+
+            if len(df_month) < settings["warmup"] + 10:
+                month_returns = [0.0] * len(todo)
+                month_trades = [trade_returns_pct(None, settings)] * len(todo)
+            else:
+                month_returns, month_trades, _ = simulate_month_grid(
+                    df_month,
+                    todo,
+                    settings["initial_balance"],
+                    timeframe,
+                    settings
+                )
+
+            for combo, month_return, trade_returns in zip(
+                todo, month_returns, month_trades
+            ):
+                rows.append({
+                    "year": year,
+                    "month": month,
+                    **combo,
+                    "month_return": float(month_return),
+                    "trade_returns": trade_returns,
+                    "data_key": data_keys[(year, month)],
+                })
+
+        new = pd.DataFrame(rows, columns=columns)
+        cached = new if cached.empty else pd.concat([cached, new])
+
+        closed = [
+            month_is_closed(y, m)
+            for y, m in zip(cached["year"], cached["month"])
+        ]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        cached[closed].to_pickle(path)
+
+    wanted = set(months)
+    mask = [
+        (y, m) in wanted
+        for y, m in zip(cached["year"], cached["month"])
+    ]
+    return cached[mask].reset_index(drop=True)
+
+
+def returns_matrix(results, months, combos):
+    """Matriz (meses x combos) de retornos mensais."""
+    import numpy as np
+
+    month_index = {month: i for i, month in enumerate(months)}
+    combo_index = {tuple(combo.values()): j for j, combo in enumerate(combos)}
+
+    returns = np.zeros((len(months), len(combos)))
+    for year, month, *key, month_return in zip(
+        results["year"],
+        results["month"],
+        *(results[name] for name in combos[0]),
+        results["month_return"]
+    ):
+        i = month_index.get((year, month))
+        j = combo_index.get(tuple(key))
+        if i is not None and j is not None:
+            returns[i, j] = month_return
+
+    return returns
+
+
+def walk_forward(returns, train_months: int, test_months: int):
+    """
+    Janelas rolantes sobre a matriz (meses x combos): escolhe o melhor
+    combo (retorno composto) no treino e o aplica nos meses de teste
+    seguintes. Retorna [(train_start, test_start, best_combo_idx,
+    train_return, test_returns)].
+    """
+    import numpy as np
+
+    windows = []
+    n_months = returns.shape[0]
+
+    for test_start in range(train_months, n_months, test_months):
+        train = returns[test_start - train_months:test_start]
+        test = returns[test_start:test_start + test_months]
+
+        train_growth = np.prod(1 + train, axis=0)
+        best = int(np.argmax(train_growth))
+
+        windows.append((
+            test_start - train_months,
+            test_start,
+            best,
+            train_growth[best] - 1,
+            test[:, best]
+        ))
+
+    return windows
+
+
+def run_walk_forward(
+    config_path: str = GLOBAL_CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    train_months: int | None = None,
+    test_months: int | None = None,
+    strategy_name: str | None = None
+):
+    import pandas as pd
+
+    from market_data import iter_months
+    from strategy.registry import label_params, param_grid
+
+    settings = load_settings(config_path, strategy_config_path, strategy_name)
+    strategy = settings["strategy"]
+
+    train_months = train_months or settings["walk_forward"]["train_months"]
+    test_months = test_months or settings["walk_forward"]["test_months"]
+
+    initial_balance = settings["initial_balance"]
+    output_folder = settings["output_folder"]
+    os.makedirs(output_folder, exist_ok=True)
+
+    months = list(iter_months(
+        settings["start_year"],
+        settings["start_month"],
+        settings["end_year"],
+        settings["end_month"]
+    ))
+    combos = param_grid(strategy)
+    param_header = "".join(
+        f" {param.label:>10}" for param in strategy.param_space
+    )
+
+    def label(idx):
+        year, month = months[idx]
+        return f"{year}-{month:02d}"
+
+    for symbol in settings["symbols"]:
+        for timeframe in settings["timeframes"]:
+            print(
+                f"\n🔁 WALK-FORWARD | {symbol} | TF={timeframe} "
+                f"| train={train_months}m | test={test_months}m\n"
+            )
+
+            results = compute_month_results(
+                symbol, timeframe, months, combos, settings
+            )
+            returns = returns_matrix(results, months, combos)
+
+            header = (
+                f"{'Test':<8}{param_header} "
+                f"{'Train%':>10} {'Test%':>10} {'Capital':>12}"
+            )
+            print(header)
+            print("-" * len(header))
+
+            capital = initial_balance
+            window_rows = []
+            equity_rows = []
+
+            for train_start, test_start, best, train_ret, test_rets in (
+                walk_forward(returns, train_months, test_months)
+            ):
+                combo = label_params(strategy, combos[best])
+                capital_start = capital
+
+                for offset, month_return in enumerate(test_rets):
+                    capital = max(capital * (1 + month_return), 0.0)
+                    equity_rows.append({
+                        "Month": label(test_start + offset),
+                        **combo,
+                        "MonthReturn": round(month_return * 100, 2),
+                        "Capital": round(capital, 2),
+                    })
+
+                test_ret = (
+                    capital / capital_start - 1 if capital_start > 0 else -1
+                )
+
+                values = "".join(f" {value:>10}" for value in combo.values())
+                print(
+                    f"{label(test_start):<8}{values} "
+                    f"{train_ret * 100:>9.2f}% {test_ret * 100:>9.2f}% "
+                    f"{capital:>12.2f}"
+                )
+
+                window_rows.append({
+                    "TrainStart": label(train_start),
+                    "TrainEnd": label(test_start - 1),
+                    "TestStart": label(test_start),
+                    "TestEnd": label(test_start + len(test_rets) - 1),
+                    **combo,
+                    "TrainReturn": round(train_ret * 100, 2),
+                    "TestReturn": round(test_ret * 100, 2),
+                    "Capital": round(capital, 2),
+                })
+
+            total_return = capital / initial_balance - 1
+            print(f"\nOut-of-sample total: {total_return * 100:.2f}%")
+
+            filename = (
+                f"{symbol.replace('/', '')}_"
+                f"{settings['start_month']}_{settings['start_year']}_"
+                f"{settings['end_month']}_{settings['end_year']}_"
+                f"{timeframe}_wf_{train_months}x{test_months}.xlsx"
+            )
+            full_path = os.path.join(output_folder, filename)
+
+            with pd.ExcelWriter(full_path, engine="openpyxl") as writer:
+                pd.DataFrame(window_rows).to_excel(
+                    writer, index=False, sheet_name="windows"
+                )
+                pd.DataFrame(equity_rows).to_excel(
+                    writer, index=False, sheet_name="equity"
+                )
+
+            print(f"\n📊 Walk-forward generated: {full_path}\n")
+
 # ============================================================
 # ENTRY POINT
 # ============================================================
 
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Grid search over the strategy's parameter space "
+                    "with monthly compounding."
+    )
+    parser.add_argument(
+        "--config",
+        default=GLOBAL_CONFIG_PATH,
+        help="global config file (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--strategy",
+        default=None,
+        help="strategy folder under strategy/ (default: the `strategy` "
+             "key of the global config)"
+    )
+    parser.add_argument(
+        "--strategy-config",
+        default=None,
+        help="strategy config file (default: the strategy's config.yaml)"
+    )
+    parser.add_argument(
+        "--walk-forward",
+        action="store_true",
+        help="rolling train/test windows instead of the in-sample scan"
+    )
+    parser.add_argument(
+        "--train-months",
+        type=int,
+        default=None,
+        help="walk-forward train window (default: walk_forward.train_months)"
+    )
+    parser.add_argument(
+        "--test-months",
+        type=int,
+        default=None,
+        help="walk-forward test window (default: walk_forward.test_months)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+
+    if args.walk_forward:
+        run_walk_forward(
+            args.config,
+            args.strategy_config,
+            train_months=args.train_months,
+            test_months=args.test_months,
+            strategy_name=args.strategy
+        )
+    else:
+        run(args.config, args.strategy_config, strategy_name=args.strategy)
+
+
 if __name__ == "__main__":
-    run()
+    sys.exit(main())
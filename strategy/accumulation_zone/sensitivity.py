@@ -0,0 +1,267 @@
+# strategy/accumulation_zone/sensitivity.py
+#
+# Parameter-sensitivity heatmap: max_loss_percent x min_percent_from_extreme.
+#
+# Instead of one full backtest per grid cell, each month is processed once
+# by the strategy's batched backend (`log_zones_activity_batched`):
+#
+#   1. `bar_candidates` computes, for every bar, the entry the strategy
+#      would take and the two quantities the thresholds act on
+#      (% since last extreme and loss % to the stop).
+#   2. A candidate passes a cell iff  percent >= min_extreme  and
+#      loss <= max_loss  (monotonic in both), so the accepted sets of all
+#      cells are one broadcast comparison.
+#   3. Cells with the same accepted set produce the same signals; only the
+#      distinct sets are replayed and simulated, as columns of a single
+#      VectorBT portfolio (`scanning.simulate_month_grid`).
+
+import os
+import sys
+import argparse
+
+# ============================================================
+# Ajuste de import para raiz do projeto
+# ============================================================
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+sys.path.append(PROJECT_ROOT)
+
+from executor import load_yaml
+from strategy.accumulation_zone.scanning import (
+    GLOBAL_CONFIG_PATH,
+    load_settings,
+    simulate_month_grid,
+)
+
+STRATEGY_NAME = "accumulation_zone"
+
+# ============================================================
+# CONFIG
+# ============================================================
+
+DEFAULT_MAX_LOSS_RANGE = (0.5, 5.0, 0.1)
+DEFAULT_MIN_EXTREME_RANGE = (30.0, 80.0, 1.0)
+
+
+def grid_values(start: float, stop: float, step: float):
+    """Valores de `start` a `stop` (inclusive) com passo `step`."""
+    import numpy as np
+
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+def load_sensitivity_config(strategy_config_path: str) -> dict:
+    cfg = load_yaml(strategy_config_path)["strategy"].get("sensitivity", {})
+
+    return {
+        "max_loss": tuple(cfg.get("max_loss", DEFAULT_MAX_LOSS_RANGE)),
+        "min_percent_from_extreme": tuple(
+            cfg.get("min_percent_from_extreme", DEFAULT_MIN_EXTREME_RANGE)
+        ),
+    }
+
+
+def parse_range(text: str) -> tuple[float, float, float]:
+    """'0.5:5.0:0.1' -> (0.5, 5.0, 0.1)"""
+    parts = [float(p) for p in text.split(":")]
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(
+            f"Expected start:stop:step, got '{text}'"
+        )
+    return tuple(parts)
+
+# ============================================================
+# GRID
+# ============================================================
+
+def grid_month_returns(df_month, max_losses, min_extremes, timeframe, settings):
+    """
+    Retorno do mês para cada célula do grid (vetores `max_losses` e
+    `min_extremes` com uma entrada por célula), simulado com
+    `initial_balance` como nos resultados do walk-forward.
+    """
+    import numpy as np
+
+    cells = [
+        {
+            "max_loss_percent": float(max_loss),
+            "min_percent_from_extreme": float(min_extreme),
+        }
+        for max_loss, min_extreme in zip(max_losses, min_extremes)
+    ]
+
+    month_returns, _, n_sets = simulate_month_grid(
+        df_month,
+        cells,
+        settings["initial_balance"],
+        timeframe,
+        settings
+    )
+
+    return np.asarray(month_returns), n_sets
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def run(
+    config_path: str = GLOBAL_CONFIG_PATH,
+    strategy_config_path: str | None = None,
+    max_loss_range: tuple | None = None,
+    min_extreme_range: tuple | None = None
+):
+    import numpy as np
+    import pandas as pd
+    from tqdm import tqdm
+
+    from market_data import iter_months, load_ohlcv, resolve_base_timeframe
+
+    settings = load_settings(
+        config_path, strategy_config_path, STRATEGY_NAME
+    )
+    sens_cfg = load_sensitivity_config(settings["strategy_config_path"])
+
+    max_loss_values = grid_values(*(max_loss_range or sens_cfg["max_loss"]))
+    min_extreme_values = grid_values(
+        *(min_extreme_range or sens_cfg["min_percent_from_extreme"])
+    )
+
+    # Uma entrada por célula (max_loss varia nas linhas)
+    max_losses = np.repeat(max_loss_values, len(min_extreme_values))
+    min_extremes = np.tile(min_extreme_values, len(max_loss_values))
+
+    initial_balance = settings["initial_balance"]
+    output_folder = settings["output_folder"]
+    os.makedirs(output_folder, exist_ok=True)
+
+    months = list(iter_months(
+        settings["start_year"],
+        settings["start_month"],
+        settings["end_year"],
+        settings["end_month"]
+    ))
+
+    for symbol in settings["symbols"]:
+        for timeframe in settings["timeframes"]:
+            print(
+                f"\n🗺  SENSITIVITY | {symbol} | TF={timeframe} "
+                f"| {len(max_loss_values)} x {len(min_extreme_values)} cells\n"
+            )
+
+            df_full = load_ohlcv(
+                symbol,
+                timeframe,
+                months[0],
+                months[-1],
+                settings["exchange"],
+                settings["data"],
+                resolve_base_timeframe(settings["timeframes"], settings["data"])
+            )
+
+            capital = np.full(len(max_losses), float(initial_balance))
+            peak = capital.copy()
+            max_drawdown = np.zeros(len(max_losses))
+            simulated = 0
+
+            for year, month in tqdm(months, unit="month"):
+                month_start = pd.Timestamp(year, month, 1)
+                month_end = month_start + pd.offsets.MonthEnd(1)
+                df_month = df_full.loc[month_start:month_end]
+
+                if len(df_month) < settings["warmup"] + 10:
+                    continue
+
+                month_returns, n_sets = grid_month_returns(
+                    df_month, max_losses, min_extremes, timeframe, settings
+                )
+                simulated += n_sets
+
+                capital = np.maximum(capital * (1 + month_returns), 0.0)
+                peak = np.maximum(peak, capital)
+                max_drawdown = np.minimum(max_drawdown, capital / peak - 1)
+
+            total_return = (capital / initial_balance - 1) * 100
+
+            def heatmap(values):
+                return pd.DataFrame(
+                    np.round(values, 2).reshape(
+                        len(max_loss_values), len(min_extreme_values)
+                    ),
+                    index=pd.Index(max_loss_values, name="MaxLoss"),
+                    columns=pd.Index(min_extreme_values, name="MinExtreme")
+                )
+
+            best = int(np.argmax(total_return))
+            print(
+                f"Simulated {simulated} distinct signal sets for "
+                f"{len(max_losses) * len(months)} cell-months"
+            )
+            print(
+                f"Best cell: MaxLoss={max_losses[best]}% "
+                f"MinExtreme={min_extremes[best]}% "
+                f"-> {total_return[best]:.2f}% "
+                f"(max DD {max_drawdown[best] * 100:.2f}%)"
+            )
+
+            filename = (
+                f"{symbol.replace('/', '')}_"
+                f"{settings['start_month']}_{settings['start_year']}_"
+                f"{settings['end_month']}_{settings['end_year']}_"
+                f"{timeframe}_sensitivity.xlsx"
+            )
+            full_path = os.path.join(output_folder, filename)
+
+            with pd.ExcelWriter(full_path, engine="openpyxl") as writer:
+                heatmap(total_return).to_excel(writer, sheet_name="return")
+                heatmap(max_drawdown * 100).to_excel(
+                    writer, sheet_name="drawdown"
+                )
+
+            print(f"\n📊 Sensitivity generated: {full_path}\n")
+
+# ============================================================
+# ENTRY POINT
+# ============================================================
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Return / drawdown heatmap over a dense "
+                    "max_loss_percent x min_percent_from_extreme grid."
+    )
+    parser.add_argument(
+        "--config",
+        default=GLOBAL_CONFIG_PATH,
+        help="global config file (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--strategy-config",
+        default=None,
+        help="strategy config file (default: the strategy's config.yaml)"
+    )
+    parser.add_argument(
+        "--max-loss",
+        type=parse_range,
+        default=None,
+        help="start:stop:step (default: sensitivity.max_loss)"
+    )
+    parser.add_argument(
+        "--min-extreme",
+        type=parse_range,
+        default=None,
+        help="start:stop:step (default: sensitivity.min_percent_from_extreme)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None):
+    args = build_parser().parse_args(argv)
+    run(
+        args.config,
+        args.strategy_config,
+        max_loss_range=args.max_loss,
+        min_extreme_range=args.min_extreme
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
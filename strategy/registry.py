@@ -0,0 +1,196 @@
+# strategy/registry.py
+#
+# Strategy registry. Every strategy lives in `strategy/<name>/`, with its
+# own `config.yaml` and a `<name>.py` module exposing `STRATEGY` (a
+# `Strategy`). The executor and the scanning tools only talk to a strategy
+# through this interface, so the one selected by the global `strategy:`
+# key can be any folder under `strategy/`.
+#
+# Strategy modules are only imported by `get_strategy`, so `--help` and
+# plain imports of the tools stay fast.
+
+import os
+import importlib
+
+from collections import namedtuple
+from functools import lru_cache
+
+STRATEGY_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_STRATEGY = "accumulation_zone"
+
+# Opções extras de `signals` (ver `Strategy.features`):
+#   intrabar -> `intrabar=`: saídas no nível atingido; devolve exit_prices
+#   records  -> `return_records=True`: registros por barra no fim da tupla
+#   gaps     -> `gaps=`: reinicia a janela depois de candles ausentes
+FEATURES = ("intrabar", "records", "gaps")
+
+# `streaming(open_, high, low, close, state, **params, **opções)` processa
+# um bloco precedido das últimas `warmup - 1` barras do bloco anterior e
+# devolve os itens de `signals` seguidos do estado para o próximo bloco
+# (None no primeiro).
+
+# Um eixo do grid do scanner: nome do kwarg, rótulo das planilhas, valores
+# e unidade exibida depois do valor
+Param = namedtuple(
+    "Param",
+    ["name", "label", "values", "unit"],
+    defaults=("",)
+)
+
+Strategy = namedtuple(
+    "Strategy",
+    [
+        "name",         # pasta / módulo em strategy/
+        "config_path",  # config.yaml da estratégia
+        "params",       # strategy_cfg -> kwargs de `signals`
+        "param_space",  # tuple[Param], varrido pelo scanner
+        "warmup",       # params -> barras necessárias antes do 1º sinal
+        "signals",      # (open_, high, low, close, **params) -> 4 arrays
+        "features",     # subconjunto de FEATURES aceito por `signals`
+        "batched",      # opcional: várias combinações numa passada
+        "streaming",    # opcional: processa em blocos carregando estado
+        "version",      # aumentar quando os sinais mudarem (invalida caches)
+    ],
+    defaults=(frozenset(), None, None, 1)
+)
+
+
+def available_strategies() -> list[str]:
+    """Pastas de `strategy/` com um módulo `<nome>.py`."""
+    return sorted(
+        name
+        for name in os.listdir(STRATEGY_DIR)
+        if os.path.isfile(os.path.join(STRATEGY_DIR, name, f"{name}.py"))
+    )
+
+
+@lru_cache(maxsize=None)
+def get_strategy(name: str | None = None) -> Strategy:
+    name = name or DEFAULT_STRATEGY
+
+    if name not in available_strategies():
+        raise ValueError(
+            f"Unknown strategy '{name}' "
+            f"(available: {', '.join(available_strategies())})"
+        )
+
+    module = importlib.import_module(f"strategy.{name}.{name}")
+    return module.STRATEGY
+
+
+def param_grid(strategy: Strategy) -> list[dict]:
+    """Todas as combinações de `param_space`, na ordem dos eixos."""
+    import itertools
+
+    names = [param.name for param in strategy.param_space]
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(
+            *(param.values for param in strategy.param_space)
+        )
+    ]
+
+
+def format_params(strategy: Strategy, combo: dict, sep: str = " | ") -> str:
+    """'MaxLoss=1.5% | MinExtreme=40.0%'"""
+    return sep.join(
+        f"{param.label}={combo[param.name]}{param.unit}"
+        for param in strategy.param_space
+    )
+
+
+def label_params(strategy: Strategy, combo: dict) -> dict:
+    """{rótulo: valor}, para as colunas das planilhas."""
+    return {param.label: combo[param.name] for param in strategy.param_space}
+
+
+def check_features(strategy: Strategy, **requested):
+    """ValueError se alguma opção pedida (valor verdadeiro) não existe."""
+    missing = [
+        feature
+        for feature, wanted in requested.items()
+        if wanted and feature not in strategy.features
+    ]
+    if missing:
+        raise ValueError(
+            f"Strategy '{strategy.name}' does not support: "
+            f"{', '.join(missing)}"
+        )
+
+# ============================================================
+# Backends genéricos
+# ============================================================
+
+def batched_signals(strategy, open_, high, low, close, param_sets, params):
+    """
+    Sinais de várias combinações (`param_sets`, dicts que sobrescrevem
+    `params`). Usa `strategy.batched` quando existe; senão roda `signals`
+    uma vez por combinação.
+
+    Retorna as quatro matrizes (barras x colunas) e a coluna de cada
+    combinação; combinações com sinais idênticos podem dividir a coluna.
+    """
+    import numpy as np
+
+    if strategy.batched is not None:
+        return strategy.batched(open_, high, low, close, param_sets, **params)
+
+    columns = [
+        strategy.signals(open_, high, low, close, **{**params, **overrides})
+        for overrides in param_sets
+    ]
+    matrices = tuple(
+        np.column_stack([col[k] for col in columns])
+        for k in range(4)
+    )
+    return (*matrices, np.arange(len(param_sets)))
+
+
+def panel_signals(strategy, open_, high, low, close, params):
+    """
+    Versão em painel: recebe matrizes (barras x símbolos) alinhadas no
+    mesmo índice de tempo e devolve as quatro matrizes de sinais.
+
+    Barras ausentes (NaN) de um símbolo são removidas antes de rodar a
+    estratégia nessa coluna, e os sinais voltam para as posições
+    originais; nas barras ausentes todos os sinais ficam False.
+    """
+    import numpy as np
+
+    open_ = np.asarray(open_, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    n_bars, n_symbols = close.shape
+    warmup = strategy.warmup(params)
+
+    signals = tuple(
+        np.zeros((n_bars, n_symbols), dtype=bool)
+        for _ in range(4)
+    )
+
+    for col in range(n_symbols):
+        valid = ~(
+            np.isnan(open_[:, col])
+            | np.isnan(high[:, col])
+            | np.isnan(low[:, col])
+            | np.isnan(close[:, col])
+        )
+
+        if valid.sum() < warmup:
+            continue
+
+        col_signals = strategy.signals(
+            open_[valid, col],
+            high[valid, col],
+            low[valid, col],
+            close[valid, col],
+            **params
+        )
+
+        for out, col_out in zip(signals, col_signals):
+            out[valid, col] = col_out
+
+    return signals